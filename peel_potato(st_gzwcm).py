@@ -20,8 +20,8 @@ BATCH = "gzwcm"
 
 import sys
 import os
-import datetime
 import random
+import time
 from PyQt6 import QtWidgets, QtCore, QtGui
 
 # Import our refactored services
@@ -30,6 +30,32 @@ from peel_potato_parser import RangeParser
 from peel_potato_chart_builder import ChartBuilder
 from peel_potato_controller import ChartController
 
+# Active-sheet polling: the original 5 s rate right after a change, backing off while idle
+POLL_FAST_MS = 5000
+POLL_IDLE_MS = 15000
+POLL_IDLE_TICKS = 3
+
+# Chart type keyword -> multi_mode options, checked in order against the chart text
+MULTI_MODE_TABLE = (
+    ('line', ["Normal", "Stacked", "100% Stacked"]),
+    ('column', ["Clustered", "Stacked", "100% Stacked"]),
+    ('bar', ["Clustered", "Stacked", "100% Stacked"]),
+    ('area', ["Normal", "Stacked", "100% Stacked"]),
+    ('pie', ["Pie", "Doughnut", "Pie of Pie"]),
+    ('scatter', ["Scatter", "Scatter with lines"]),
+    ('radar', ["Radar", "Filled Radar"]),
+)
+MULTI_MODE_DEFAULT = ["Default"]
+
+# Error dialog titles, one picked at random per error
+POTATO_ERROR_TITLES = (
+    "🥔 Oops! The potato got mashed!",
+    "🥔 The potato peeler hit a snag!",
+    "🥔 Potato malfunction detected!",
+    "🥔 The potato needs a moment...",
+    "🥔 Chart potato overcooked!",
+)
+
 # Import ST_GZWCM utilities
 from st_gzwcm_info import info
 from st_gzwcm_sum import sum as gzwcm_sum
@@ -49,6 +75,9 @@ class PeelPotatoWindow(QtWidgets.QWidget):
             chart_builder=ChartBuilder()
         )
         
+        # Help dialog is built on first use and reused afterwards
+        self._help_dialog = None
+        
         self._setup_ui()
         self._setup_polling()
         
@@ -110,8 +139,10 @@ class PeelPotatoWindow(QtWidgets.QWidget):
         values_label.setStyleSheet("color: #d35400; font-size: 12pt;")
         form.addRow(values_label, self.values_input)
         
-        # Multi-value mode
+        # Multi-value mode (backed by a string list model so refreshes only swap data)
         self.multi_mode = QtWidgets.QComboBox()
+        self._multi_mode_model = QtCore.QStringListModel(self.multi_mode)
+        self.multi_mode.setModel(self._multi_mode_model)
         form.addRow("Multi mode:", self.multi_mode)
         
         layout.addLayout(form)
@@ -202,6 +233,13 @@ class PeelPotatoWindow(QtWidgets.QWidget):
         self.log_board.hide()
         layout.addWidget(self.log_board)
         
+        # Lines logged in one burst are flushed together on the next event-loop turn
+        self._log_buffer = []
+        self._log_flush_timer = QtCore.QTimer(self)
+        self._log_flush_timer.setSingleShot(True)
+        self._log_flush_timer.setInterval(0)
+        self._log_flush_timer.timeout.connect(self._flush_log)
+        
         self.setLayout(layout)
         self.adjustSize()
     
@@ -231,34 +269,82 @@ class PeelPotatoWindow(QtWidgets.QWidget):
     
     def _setup_polling(self):
         """Setup polling timer for active Excel sheet."""
+        self._last_workbook = None
+        self._last_active = None
+        self.load_label.setText("Loading...")
+        
+        self._poll_interval = POLL_FAST_MS
+        self._poll_idle_ticks = 0
+        self._poll_paused = False
+        self._poll_in_progress = False
+        
+        # Single-shot timer re-armed after each poll so ticks never pile up
         self.poll_timer = QtCore.QTimer(self)
-        self.poll_timer.setInterval(5000)  # 5 seconds
-        self.poll_timer.timeout.connect(self._poll_active_sheet)
-        self.poll_timer.start()
+        self.poll_timer.setSingleShot(True)
+        self.poll_timer.timeout.connect(self._poll_once)
         
         # Initial poll shortly after startup
-        QtCore.QTimer.singleShot(100, self._poll_active_sheet)
+        self.poll_timer.start(100)
+    
+    def _poll_once(self):
+        """Run one poll (unless a chart operation is running) and schedule the next."""
+        if self._poll_in_progress:
+            return
+        started = time.perf_counter()
+        
+        if not self._poll_paused:
+            self._poll_in_progress = True
+            try:
+                if self._poll_active_sheet():
+                    self._poll_interval = POLL_FAST_MS
+                    self._poll_idle_ticks = 0
+                else:
+                    self._poll_idle_ticks += 1
+                    if self._poll_idle_ticks >= POLL_IDLE_TICKS:
+                        self._poll_interval = POLL_IDLE_MS
+            finally:
+                self._poll_in_progress = False
+        
+        # Only wait for the remainder of the interval after the poll's own COM time
+        elapsed_ms = int((time.perf_counter() - started) * 1000)
+        self.poll_timer.start(max(100, self._poll_interval - elapsed_ms))
     
     def _poll_active_sheet(self):
-        """Poll for active Excel workbook and sheet."""
+        """Poll for active Excel workbook and sheet.
+        
+        Returns:
+            bool: True if the active workbook/sheet changed since the last poll
+        """
         try:
-            self.load_label.setText("Loading...")
-            QtWidgets.QApplication.processEvents()
-            
             workbook_name, sheet_name = self.controller.get_active_sheet_info()
             
+            # Nothing changed since the last tick: leave the labels alone
+            if (workbook_name, sheet_name) == self._last_active:
+                return False
+            self._last_active = (workbook_name, sheet_name)
+            
+            # A chart from another workbook can't be modified; drop it before COM goes stale
+            if workbook_name and workbook_name != self._last_workbook:
+                if self._last_workbook is not None:
+                    self.controller.forget_last_chart()
+                self._last_workbook = workbook_name
+            
             if workbook_name and sheet_name:
                 self.active_label.setText(f"{workbook_name} → {sheet_name}")
                 self.load_label.setText("✓ Ready")
             else:
                 self.active_label.setText("(no Excel detected)")
                 self.load_label.setText("(waiting)")
+            return True
         except Exception:
+            self._last_active = None
             self.active_label.setText("(error detecting Excel)")
             self.load_label.setText("(error)")
+            return False
     
     def _on_create(self):
         """Handle Create button click."""
+        self._set_chart_buttons_enabled(False)
         self._set_status("Creating chart…", busy=True)
         self._log("Starting chart creation...")
         
@@ -276,9 +362,11 @@ class PeelPotatoWindow(QtWidgets.QWidget):
             self._show_error("Chart Creation", str(e))
         finally:
             self._set_status("", busy=False)
+            self._reenable_chart_buttons_later()
     
     def _on_change(self):
         """Handle Change button click."""
+        self._set_chart_buttons_enabled(False)
         self._set_status("Modifying chart…", busy=True)
         self._log("Starting chart modification...")
         
@@ -296,6 +384,7 @@ class PeelPotatoWindow(QtWidgets.QWidget):
             self._show_error("Chart Modification", str(e))
         finally:
             self._set_status("", busy=False)
+            self._reenable_chart_buttons_later()
     
     def _on_sum(self):
         """Handle Sum button click."""
@@ -362,6 +451,30 @@ class PeelPotatoWindow(QtWidgets.QWidget):
         finally:
             self._set_status("", busy=False)
     
+    def _set_chart_buttons_enabled(self, enabled):
+        """Enable/disable Create and Change so a running chart op can't be queued twice.
+        
+        Polling is paused while the buttons are disabled, so a poll tick that
+        expired during the operation is skipped instead of running COM calls
+        right after it.
+        """
+        self.create_btn.setEnabled(enabled)
+        self.change_btn.setEnabled(enabled)
+        self._poll_paused = not enabled
+        if not enabled:
+            # The chart work blocks the event loop; paint the disabled state now
+            self.create_btn.repaint()
+            self.change_btn.repaint()
+    
+    def _reenable_chart_buttons_later(self):
+        """Re-enable Create/Change on the next event-loop turn.
+        
+        Chart operations run synchronously on the GUI thread, so clicks made
+        meanwhile wait in the queue. Deferring the re-enable lets those clicks
+        be delivered (and dropped) while the buttons are still disabled.
+        """
+        QtCore.QTimer.singleShot(0, lambda: self._set_chart_buttons_enabled(True))
+    
     def _handle_chart_result(self, result, action):
         """Handle the result of a chart operation."""
         # Log all messages
@@ -380,30 +493,28 @@ class PeelPotatoWindow(QtWidgets.QWidget):
     def _on_chart_type_changed(self, text):
         """Update multi_mode options when chart type changes."""
         t = text.lower()
-        self.multi_mode.clear()
-        
-        if 'line' in t:
-            self.multi_mode.addItems(["Normal", "Stacked", "100% Stacked"])
-        elif 'column' in t:
-            self.multi_mode.addItems(["Clustered", "Stacked", "100% Stacked"])
-        elif 'bar' in t:
-            self.multi_mode.addItems(["Clustered", "Stacked", "100% Stacked"])
-        elif 'area' in t:
-            self.multi_mode.addItems(["Normal", "Stacked", "100% Stacked"])
-        elif 'pie' in t:
-            self.multi_mode.addItems(["Pie", "Doughnut", "Pie of Pie"])
-        elif 'scatter' in t:
-            self.multi_mode.addItems(["Scatter", "Scatter with lines"])
-        elif 'radar' in t:
-            self.multi_mode.addItems(["Radar", "Filled Radar"])
-        else:
-            self.multi_mode.addItems(["Default"])
+        items = next((modes for key, modes in MULTI_MODE_TABLE if key in t), MULTI_MODE_DEFAULT)
+        
+        # Only touch the model when the options actually change
+        if items == self._multi_mode_model.stringList():
+            return
+        
+        # Keep the user's current mode if the new chart type offers it too
+        current = self.multi_mode.currentText()
+        self._multi_mode_model.setStringList(items)
+        idx = self.multi_mode.findText(current)
+        self.multi_mode.setCurrentIndex(idx if idx >= 0 else 0)
     
     def _on_help(self):
-        """Show help dialog."""
+        """Show help dialog, loading the help file only on the first click."""
         try:
-            help_path = os.path.join(os.path.dirname(__file__), 'media', 'help_st_gzwcm.html')
-            if os.path.exists(help_path):
+            if self._help_dialog is None:
+                help_path = os.path.join(os.path.dirname(__file__), 'media', 'help_st_gzwcm.html')
+                if not os.path.exists(help_path):
+                    QtWidgets.QMessageBox.information(self, "Help", 
+                        "Help file not found. Please check the installation.")
+                    return
+                
                 with open(help_path, 'r', encoding='utf-8') as f:
                     help_html = f.read()
                 
@@ -422,10 +533,9 @@ class PeelPotatoWindow(QtWidgets.QWidget):
                 layout.addWidget(close_btn)
                 
                 dialog.setLayout(layout)
-                dialog.exec()
-            else:
-                QtWidgets.QMessageBox.information(self, "Help", 
-                    "Help file not found. Please check the installation.")
+                self._help_dialog = dialog
+            
+            self._help_dialog.exec()
         except Exception as e:
             QtWidgets.QMessageBox.warning(self, "Help Error", f"Could not load help: {e}")
     
@@ -440,13 +550,39 @@ class PeelPotatoWindow(QtWidgets.QWidget):
         QtCore.QTimer.singleShot(0, lambda: self.adjustSize())
     
     def _log(self, message):
-        """Append message to log board."""
+        """Queue message for the log board; the buffer is flushed on the next event-loop turn."""
         try:
-            timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-            self.log_board.append(f"[{timestamp}] {message}")
-            self.log_board.verticalScrollBar().setValue(
-                self.log_board.verticalScrollBar().maximum()
-            )
+            t = time.localtime()
+            timestamp = f"{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}"
+            self._log_buffer.append(f"[{timestamp}] {message}")
+            if not self._log_flush_timer.isActive():
+                self._log_flush_timer.start()
+        except Exception:
+            pass
+    
+    def _flush_log(self):
+        """Append all buffered log lines in one document edit and scroll to the end."""
+        if not self._log_buffer:
+            return
+        lines, self._log_buffer = self._log_buffer, []
+        try:
+            document = self.log_board.document()
+            cursor = QtGui.QTextCursor(document)
+            cursor.movePosition(QtGui.QTextCursor.MoveOperation.End)
+            # One edit block: the document is laid out once for the whole batch
+            cursor.beginEditBlock()
+            try:
+                for line in lines:
+                    if not document.isEmpty():
+                        cursor.insertBlock(QtGui.QTextBlockFormat(), QtGui.QTextCharFormat())
+                    # Lines with markup (e.g. <b>) are HTML; the rest stay plain text
+                    if '<' in line and '>' in line:
+                        cursor.insertHtml(line)
+                    else:
+                        cursor.insertText(line, QtGui.QTextCharFormat())
+            finally:
+                cursor.endEditBlock()
+            self.log_board.moveCursor(QtGui.QTextCursor.MoveOperation.End)
         except Exception:
             pass
     
@@ -454,7 +590,9 @@ class PeelPotatoWindow(QtWidgets.QWidget):
         """Set status label text and cursor."""
         try:
             self.status_label.setText(text)
-            QtWidgets.QApplication.processEvents()
+            # Repaint just this label; draining the whole event queue here lets
+            # queued clicks/timer ticks re-enter while COM work is in flight
+            self.status_label.repaint()
             if busy:
                 QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.CursorShape.WaitCursor)
             else:
@@ -464,15 +602,7 @@ class PeelPotatoWindow(QtWidgets.QWidget):
     
     def _show_error(self, title, message):
         """Show error message dialog with potato theme."""
-        potato_titles = [
-            "🥔 Oops! The potato got mashed!",
-            "🥔 The potato peeler hit a snag!",
-            "🥔 Potato malfunction detected!",
-            "🥔 The potato needs a moment...",
-            "🥔 Chart potato overcooked!"
-        ]
-        
-        error_title = random.choice(potato_titles)
+        error_title = random.choice(POTATO_ERROR_TITLES)
         error_msg = f"{title} encountered an issue:\n\n{str(message)[:200]}"
         
         try:
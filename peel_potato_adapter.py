@@ -17,55 +17,160 @@ if getattr(sys, 'frozen', False):
 
 import xlwings as xw
 
-try:
-    from win32com.client import constants as xlconst
-except Exception:
-    xlconst = None
+# Excel's xlCalculationManual; a fixed enum value, so no win32com constants lookup
+_XL_CALCULATION_MANUAL = -4135
+
+def _unwrap(api):
+    """Strip xlwings' COMRetryObjectWrapper, returning the pywin32 object."""
+    try:
+        return object.__getattribute__(api, '_inner')
+    except AttributeError:
+        return api
+
+
+def _early_bound(api):
+    """Return an early-bound (gencache) wrapper for a COM object, or the raw object.
+    
+    xlwings hands out late-bound objects behind a retry wrapper, so every
+    property set is a name lookup plus a retry loop; the makepy wrapper binds
+    dispatch IDs from the cached Excel type library instead.
+    
+    Args:
+        api: COM object, possibly wrapped by xlwings
+        
+    Returns:
+        Early-bound COM object, falling back to the unwrapped late-bound object
+    """
+    api = _unwrap(api)
+    try:
+        from win32com.client import gencache
+        return gencache.EnsureDispatch(api)
+    except Exception:
+        return api
 
 
 class ExcelAdapter:
     """Responsible for all Excel/COM API interactions."""
     
     def __init__(self):
-        pass
+        # Workbook name -> xlwings Book, rebuilt only when the open-book count changes
+        self._books_by_name = {}
+        self._books_count = None
+        # (raw Application, early-bound wrapper) for the last Excel instance seen
+        self._app_pair = None
     
-    def get_active_sheet(self):
-        """Get the currently focused xlwings Sheet object.
+    def _find_book(self, app, bname, refresh=False):
+        """Look up an open workbook by name without walking app.books on every call.
         
+        Args:
+            app: xlwings App object
+            bname: Workbook name
+            refresh: Force the name map to be rebuilt
+            
         Returns:
-            xlwings Sheet object or None if no Excel instance is active
+            xlwings Book object or None
         """
         try:
-            app = xw.apps.active
-            if app is None:
-                return None
+            count = app.books.count
+        except Exception:
+            count = None
+        
+        if refresh or count != self._books_count or bname not in self._books_by_name:
+            self._books_by_name = {b.name: b for b in app.books}
+            self._books_count = count
+        
+        return self._books_by_name.get(bname)
+    
+    def _application(self, sheet):
+        """Return an early-bound Application for the sheet's Excel instance.
+        
+        Fetching Application is one call, but building the early-bound wrapper
+        queries the type library each time. The wrapper is reused while the
+        sheet belongs to the same instance; pywin32 compares COM identities
+        locally, so the check itself costs no round trip.
+        
+        Args:
+            sheet: xlwings Sheet object
             
+        Returns:
+            Excel Application COM object
+        """
+        raw = _unwrap(sheet.api.Application)
+        pair = self._app_pair
+        if pair is not None:
             try:
-                active_wb_api = app.api.ActiveWorkbook
-                active_sh_api = app.api.ActiveSheet
-                bname = getattr(active_wb_api, 'Name', None)
-                sname = getattr(active_sh_api, 'Name', None)
+                if pair[0] == raw:
+                    return pair[1]
             except Exception:
-                bname = None
-                sname = None
-            
-            book = None
-            if bname:
-                for b in app.books:
-                    if b.name == bname:
-                        book = b
-                        break
-            if book is None and app.books:
-                book = app.books[0]
-            if book is None:
-                return None
+                # Cached instance is gone; bind the new one below
+                pass
+        app_api = _early_bound(raw)
+        self._app_pair = (raw, app_api)
+        return app_api
+    
+    def _active_names(self, app):
+        """Read the active workbook and sheet names from one Application handle.
+        
+        Args:
+            app: xlwings App object
             
+        Returns:
+            tuple: (workbook_name, sheet_name), either may be None
+        """
+        try:
+            app_api = app.api
+            bname = getattr(app_api.ActiveWorkbook, 'Name', None)
+            sname = getattr(app_api.ActiveSheet, 'Name', None)
+            return bname, sname
+        except Exception:
+            return None, None
+    
+    def _resolve_active_book_sheet(self):
+        """Resolve the focused workbook and sheet through the cached book map.
+        
+        Returns:
+            tuple: (xlwings Book, xlwings Sheet) or (None, None) if no Excel instance is active
+        """
+        app = xw.apps.active
+        if app is None:
+            return None, None
+        
+        bname, sname = self._active_names(app)
+        
+        book = self._find_book(app, bname) if bname else None
+        if book is None and app.books:
+            book = app.books[0]
+        if book is None:
+            return None, None
+        
+        try:
+            return book, self._pick_sheet(book, sname)
+        except Exception:
+            # Cached Book went stale (closed/reopened under the same name)
+            book = self._find_book(app, bname, refresh=True) or app.books[0]
+            return book, self._pick_sheet(book, sname)
+    
+    def _pick_sheet(self, book, sname):
+        """Return the named sheet, or the first sheet if it isn't in this book.
+        
+        Indexing by name is a single Worksheets(name) call, instead of reading
+        every sheet's name to test membership first.
+        """
+        if sname:
             try:
-                if sname and sname in [s.name for s in book.sheets]:
-                    return book.sheets[sname]
-                return book.sheets[0]
+                return book.sheets[sname]
             except Exception:
-                return book.sheets[0]
+                pass
+        return book.sheets[0]
+    
+    def get_active_sheet(self):
+        """Get the currently focused xlwings Sheet object.
+        
+        Returns:
+            xlwings Sheet object or None if no Excel instance is active
+        """
+        try:
+            return self._resolve_active_book_sheet()[1]
         except Exception:
             return None
     
@@ -79,15 +184,7 @@ class ExcelAdapter:
             app = xw.apps.active
             if app is None:
                 return None, None
-            
-            try:
-                active_wb_api = app.api.ActiveWorkbook
-                active_sh_api = app.api.ActiveSheet
-                bname = getattr(active_wb_api, 'Name', None)
-                sname = getattr(active_sh_api, 'Name', None)
-                return bname, sname
-            except Exception:
-                return None, None
+            return self._active_names(app)
         except Exception:
             return None, None
     
@@ -124,14 +221,15 @@ class ExcelAdapter:
         Returns:
             tuple: (app_api, saved_state_dict) for later restoration
         """
-        sht_api = sheet.api
         app_api = None
         _excel_saved = {}
         
         try:
-            app_api = sht_api.Application
+            # Early-bound Application: the state toggles below and in
+            # end_performance_mode are plain dispatch-ID property sets
+            app_api = self._application(sheet)
             
-            # Save current state
+            # Save current state; a user or add-in may have any of these off already
             try:
                 _excel_saved['ScreenUpdating'] = app_api.ScreenUpdating
             except Exception:
@@ -162,11 +260,14 @@ class ExcelAdapter:
                 app_api.DisplayAlerts = False
             except Exception:
                 pass
-            try:
-                manual_calc = getattr(xlconst, 'xlCalculationManual', -4135) if xlconst is not None else -4135
-                app_api.Calculation = manual_calc
-            except Exception:
-                pass
+            if _excel_saved['Calculation'] == _XL_CALCULATION_MANUAL:
+                # Already manual: nothing to switch or restore
+                _excel_saved['Calculation'] = None
+            else:
+                try:
+                    app_api.Calculation = _XL_CALCULATION_MANUAL
+                except Exception:
+                    pass
         except Exception:
             app_api = None
         
@@ -217,23 +318,23 @@ class ExcelAdapter:
         """
         try:
             sht_api = sheet.api
-            app_api = sht_api.Application
+            app_api = self._application(sheet)
             
-            # Check if selection is a ChartObject
+            # Selected ChartObject, or a chart element inside an active chart;
+            # getattr fetches each candidate in one lookup instead of hasattr + get
             try:
-                selection = app_api.Selection
-                if hasattr(selection, 'Chart'):
-                    return selection.Chart
+                chart = getattr(app_api.Selection, 'Chart', None) or getattr(app_api, 'ActiveChart', None)
+                if chart is not None:
+                    return chart
             except Exception:
                 pass
             
-            # Check if active chart exists
+            # Fall back to the most recently created chart on the sheet
             try:
-                if hasattr(sht_api, 'ChartObjects'):
-                    chart_objects = sht_api.ChartObjects()
-                    if chart_objects.Count > 0:
-                        # Return most recently created chart
-                        return chart_objects(chart_objects.Count).Chart
+                chart_objects = sht_api.ChartObjects()
+                count = chart_objects.Count
+                if count > 0:
+                    return chart_objects(count).Chart
             except Exception:
                 pass
             
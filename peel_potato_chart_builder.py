@@ -2,6 +2,8 @@
 Chart Builder for Peel Potato.
 Handles all chart creation and modification logic, isolated from UI.
 """
+from functools import lru_cache
+
 import peel_potato_prettify
 
 try:
@@ -10,13 +12,87 @@ except Exception:
     xlconst = None
 
 
+def _xl_const(name, default):
+    """Resolve an Excel constant once, falling back to its documented value."""
+    if xlconst is None:
+        return default
+    try:
+        return getattr(xlconst, name)
+    except AttributeError:
+        return default
+
+
+def _raw_com(api):
+    """Strip xlwings' COMRetryObjectWrapper so hot-path calls go straight to pywin32."""
+    try:
+        return object.__getattribute__(api, '_inner')
+    except AttributeError:
+        return api
+
+
+# Chart type keywords, checked in order against the lowercased chart text
+_CHART_TYPE_KEYS = ('line', 'column', 'bar', 'area', 'pie', 'scatter', 'radar')
+
+# (chart keyword, mode keyword) -> Excel ChartType, resolved once at import
+_CHART_CONSTANTS = {
+    ('line', ''): _xl_const('xlLine', 4),
+    ('line', 'stacked'): _xl_const('xlLineStacked', 63),
+    ('line', 'stacked100'): _xl_const('xlLineStacked100', 64),
+    ('column', ''): _xl_const('xlColumnClustered', 51),
+    ('column', 'stacked'): _xl_const('xlColumnStacked', 52),
+    ('column', 'stacked100'): _xl_const('xlColumnStacked100', 53),
+    ('bar', ''): _xl_const('xlBarClustered', 57),
+    ('bar', 'stacked'): _xl_const('xlBarStacked', 58),
+    ('bar', 'stacked100'): _xl_const('xlBarStacked100', 59),
+    ('area', ''): _xl_const('xlArea', 1),
+    ('area', 'stacked'): _xl_const('xlAreaStacked', 76),
+    ('area', 'stacked100'): _xl_const('xlAreaStacked100', 77),
+    ('pie', ''): _xl_const('xlPie', 5),
+    ('pie', 'doughnut'): _xl_const('xlDoughnut', -4120),
+    ('pie', 'pieof'): _xl_const('xlPieOfPie', 68),
+    ('scatter', ''): _xl_const('xlXYScatter', -4169),
+    ('radar', ''): _xl_const('xlRadar', -4151),
+}
+_CHART_FALLBACK = _CHART_CONSTANTS[('column', '')]
+_XL_COLUMNS = _xl_const('xlColumns', 2)
+
+# Widest header row span read in one block when naming series; beyond this the
+# scattered columns are read one cell at a time
+_HEADER_SPAN_LIMIT = 256
+
+
+@lru_cache(maxsize=64)
+def _chart_constant(ct, m):
+    """Look up the ChartType for lowercased chart text and mode text."""
+    chart_key = next((key for key in _CHART_TYPE_KEYS if key in ct), None)
+    if chart_key is None:
+        return _CHART_FALLBACK
+    
+    if '100' in m:
+        mode_key = 'stacked100'
+    elif 'stack' in m:
+        mode_key = 'stacked'
+    elif 'doughnut' in m:
+        mode_key = 'doughnut'
+    elif 'pie of' in m:
+        mode_key = 'pieof'
+    else:
+        mode_key = ''
+    
+    const = _CHART_CONSTANTS.get((chart_key, mode_key))
+    if const is None:
+        const = _CHART_CONSTANTS.get((chart_key, ''), _CHART_FALLBACK)
+    return const
+
+
 class ChartBuilder:
     """Responsible for creating and modifying Excel charts."""
     
     def __init__(self):
         self._last_chart = None
     
-    def create(self, sheet, dim_range, value_ranges, chart_type, multi_mode, modify=False):
+    def create(self, sheet, dim_range, value_ranges, chart_type, multi_mode, modify=False,
+               source_block=None):
         """Create or modify a chart on the given sheet.
         
         Args:
@@ -26,26 +102,24 @@ class ChartBuilder:
             chart_type: String chart type (e.g., "Line", "Column", "Pie")
             multi_mode: String mode (e.g., "Clustered", "Stacked")
             modify: If True, modify existing chart instead of creating new
+            source_block: Optional COM Range covering the header row, the
+                dimension column and value_ranges as adjacent columns; when
+                given, series are created with one SetSourceData
             
         Returns:
             tuple: (chart_object, dim_name, value_names_list, log_messages)
         """
         log_messages = []
-        sht_api = sheet.api
-        
-        # Ensure win32 constants available
-        if xlconst is None:
-            from win32com.client import constants as xlconst_local
-            _xl = xlconst_local
-        else:
-            _xl = xlconst
+        # Chart calls run inside performance mode, so skip xlwings' per-call retry loop
+        sht_api = _raw_com(sheet.api)
         
         # Create or reuse chart object
         chart = None
+        current_type = None
         if modify and self._last_chart is not None:
-            # Validate that the chart still exists
+            # Validate that the chart still exists (the type read doubles as a no-op check)
             try:
-                _ = self._last_chart.ChartType
+                current_type = self._last_chart.ChartType
                 chart = self._last_chart
                 log_messages.append("Modifying existing chart")
             except Exception:
@@ -69,23 +143,25 @@ class ChartBuilder:
         # Remember last chart
         self._last_chart = chart
         
-        # Determine Excel chart constant and set type
-        chart_const = self._get_chart_constant(chart_type, multi_mode, _xl)
+        # Determine Excel chart constant; it is applied once the series exist
+        chart_const = self._get_chart_constant(chart_type, multi_mode)
         log_messages.append(f"Creating {chart_type} chart with {multi_mode} mode")
         
-        try:
-            chart.ChartType = chart_const
-        except Exception as e:
-            log_messages.append(f"Warning: Could not set chart type: {e}")
-        
         # Build the chart based on type
         chart_type_lower = chart_type.lower()
         
         if 'scatter' in chart_type_lower:
-            self._build_scatter_chart(chart, dim_range, value_ranges, _xl, log_messages)
+            self._build_scatter_chart(chart, dim_range, value_ranges, log_messages)
         else:
             self._build_standard_chart(chart, sheet, dim_range, value_ranges, chart_type, 
-                                      multi_mode, modify, _xl, log_messages)
+                                      multi_mode, modify, log_messages, source_block)
+        
+        # Set chart type once, after all series are attached; skip no-op writes on modify
+        if current_type != chart_const:
+            try:
+                chart.ChartType = chart_const
+            except Exception as e:
+                log_messages.append(f"Warning: Could not set chart type: {e}")
         
         # Set chart title
         chart.HasTitle = True
@@ -104,7 +180,54 @@ class ChartBuilder:
         
         return chart, dim_name, value_names, log_messages
     
-    def _build_scatter_chart(self, chart, dim_range, value_ranges, _xl, log_messages):
+    def retype(self, chart_type, multi_mode, dim_range, value_ranges):
+        """Change the last chart's type in place, keeping its existing series.
+        
+        Args:
+            chart_type: String chart type (e.g., "Line", "Column", "Pie")
+            multi_mode: String mode (e.g., "Clustered", "Stacked")
+            dim_range: xlwings Range the chart was built from, used for the title
+            value_ranges: List of xlwings Range objects the chart was built from
+            
+        Returns:
+            tuple: (chart_object, dim_name, value_names_list, log_messages), or
+            None if there is no live chart to change
+        """
+        chart = self._last_chart
+        if chart is None:
+            return None
+        
+        try:
+            current_type = chart.ChartType
+        except Exception:
+            # Chart no longer exists; the caller falls back to a full rebuild
+            self._last_chart = None
+            return None
+        
+        log_messages = [f"Changing chart to {chart_type} with {multi_mode} mode, keeping series"]
+        
+        chart_const = self._get_chart_constant(chart_type, multi_mode)
+        if current_type != chart_const:
+            try:
+                chart.ChartType = chart_const
+            except Exception as e:
+                log_messages.append(f"Warning: Could not set chart type: {e}")
+        
+        chart.HasTitle = True
+        chart.ChartTitle.Text = f"{chart_type} — Peel Potato"
+        
+        dim_name, value_names = peel_potato_prettify.apply_chart_formatting(
+            chart, dim_range, value_ranges
+        )
+        
+        if dim_name and value_names:
+            log_messages.append(f"📊 Chart title set: <b>{value_names[0]} by {dim_name}</b>")
+        
+        log_messages.append("Chart modified successfully! Applied formatting.")
+        
+        return chart, dim_name, value_names, log_messages
+    
+    def _build_scatter_chart(self, chart, dim_range, value_ranges, log_messages):
         """Build a scatter chart."""
         if len(value_ranges) == 0:
             raise ValueError("No value ranges parsed for scatter chart")
@@ -120,12 +243,11 @@ class ChartBuilder:
         series = chart.SeriesCollection().NewSeries()
         series.XValues = x_range
         series.Values = y_range
-        chart.ChartType = _xl.xlXYScatter
         
         log_messages.append(f"Added scatter series with X and Y ranges")
     
     def _build_standard_chart(self, chart, sheet, dim_range, value_ranges, chart_type, 
-                             multi_mode, modify, _xl, log_messages):
+                             multi_mode, modify, log_messages, source_block=None):
         """Build standard charts (line, bar, column, area, pie, etc.)."""
         if not value_ranges:
             raise ValueError("No value ranges parsed for chart")
@@ -133,50 +255,119 @@ class ChartBuilder:
         # Determine header row
         header_row = self._find_header_row(sheet, value_ranges)
         
-        # If modifying, clear existing series first
-        if modify:
-            try:
-                while chart.SeriesCollection().Count > 0:
-                    chart.SeriesCollection(1).Delete()
-                log_messages.append("Cleared existing series")
-            except Exception:
-                pass
-        
-        # Create series for each value range
         chart_type_lower = chart_type.lower()
-        for idx, vr in enumerate(value_ranges):
+        sht_api = _raw_com(sheet.api)
+        dim_api = dim_range.api if dim_range is not None else None
+        # (series, index, value column) awaiting a name; headers are read in one go
+        pending_names = []
+        
+        # Adjacent value columns: one SetSourceData replaces any existing series
+        # and lets Excel take categories and series names from the block
+        used_block = False
+        if source_block is not None and 'pie' not in chart_type_lower:
             try:
-                # Pie charts only use first value column
-                if 'pie' in chart_type_lower and idx > 0:
-                    break
-                
-                s = chart.SeriesCollection().NewSeries()
-                s.Values = vr.api
+                # Excel only takes the first row as series names when those cells are text
+                header_cells = source_block.Rows(1).Value
+                if not isinstance(header_cells, tuple):
+                    header_cells = ((header_cells,),)
+                headers = header_cells[0][-len(value_ranges):]
+                if not all(isinstance(h, str) and h.strip() for h in headers):
+                    raise ValueError("value headers are not all text")
                 
-                if dim_range is not None:
-                    s.XValues = dim_range.api
-                
-                # Set series name from header row
+                chart.SetSourceData(Source=source_block, PlotBy=_XL_COLUMNS)
+                # A numeric or date dimension column becomes an extra series instead
+                # of the categories; rebuild series one by one then
+                count = chart.SeriesCollection().Count
+                if count != len(value_ranges):
+                    raise ValueError(f"expected {len(value_ranges)} series, Excel made {count}")
+                for idx, name_val in enumerate(headers):
+                    log_messages.append(f"  Series {idx+1}: {name_val}")
+                used_block = True
+                log_messages.append("Set chart source data in one block")
+            except Exception as e:
+                log_messages.append(f"Warning: Could not set source data: {e}")
+        
+        if not used_block:
+            # Clear existing series first (count once, delete from the end); also
+            # needed if a failed SetSourceData already added some
+            if modify or source_block is not None:
                 try:
-                    name_cell = sheet.api.Cells(header_row, vr.api.Column)
-                    name_val = name_cell.Value
-                    if name_val is not None:
-                        s.Name = str(name_val)
-                        log_messages.append(f"  Series {idx+1}: {name_val}")
+                    sc = chart.SeriesCollection()
+                    for i in range(sc.Count, 0, -1):
+                        sc(i).Delete()
+                    log_messages.append("Cleared existing series")
                 except Exception:
                     pass
+            
+            # Create series for each value range, reusing the collection handle
+            pending_names = []
+            series_coll = chart.SeriesCollection()
+            for idx, vr in enumerate(value_ranges):
+                try:
+                    # Pie charts only use first value column
+                    if 'pie' in chart_type_lower and idx > 0:
+                        break
                     
-            except Exception as e:
-                log_messages.append(f"Warning: Could not create series {idx+1}: {e}")
+                    vr_api = vr.api
+                    s = series_coll.NewSeries()
+                    s.Values = vr_api
+                    
+                    if dim_api is not None:
+                        s.XValues = dim_api
+                    
+                    pending_names.append((s, idx, vr_api.Column))
+                        
+                except Exception as e:
+                    log_messages.append(f"Warning: Could not create series {idx+1}: {e}")
         
-        # Set chart subtype
-        try:
-            chart.ChartType = self._get_chart_constant(chart_type, multi_mode, _xl)
-        except Exception:
-            pass
+        self._name_series(pending_names, sht_api, header_row, log_messages)
         
         log_messages.append(f"Added {len(value_ranges)} series to chart")
     
+    def _name_series(self, pending, sht_api, header_row, log_messages):
+        """Name series from the header row above their value columns.
+        
+        The header cells spanning all value columns are read with one
+        Range.Value call instead of one Cells(...).Value call per series.
+        
+        Args:
+            pending: List of (series, index, column) tuples
+            sht_api: Worksheet COM object
+            header_row: Row holding the column headers
+            log_messages: List to append log lines to
+        """
+        if not pending:
+            return
+        
+        cols = [col for _, _, col in pending]
+        first_col = min(cols)
+        last_col = max(cols)
+        cells_api = sht_api.Cells
+        
+        headers = None
+        if last_col - first_col < _HEADER_SPAN_LIMIT:
+            try:
+                if first_col == last_col:
+                    headers = (cells_api(header_row, first_col).Value,)
+                else:
+                    headers = sht_api.Range(cells_api(header_row, first_col),
+                                            cells_api(header_row, last_col)).Value[0]
+            except Exception:
+                headers = None
+        
+        for series, idx, col in pending:
+            try:
+                if headers is not None:
+                    name_val = headers[col - first_col]
+                else:
+                    # Columns too far apart (or the block read failed): read this cell alone
+                    name_val = cells_api(header_row, col).Value
+                if name_val is not None:
+                    series.Name = str(name_val)
+                    log_messages.append(f"  Series {idx+1}: {name_val}")
+            except Exception:
+                pass
+    
     def _find_header_row(self, sheet, value_ranges):
         """Find the header row (row immediately above data)."""
         header_row = 1
@@ -195,63 +386,14 @@ class ChartBuilder:
         
         return header_row
     
-    def _get_chart_constant(self, chart_text, mode_text, _xl):
+    def _get_chart_constant(self, chart_text, mode_text):
         """Map chart type + mode to Excel ChartType constant."""
-        ct = chart_text.lower()
-        m = mode_text.lower() if mode_text else ''
-        
-        try:
-            if 'line' in ct:
-                if 'stacked' in m and '100' in m:
-                    return getattr(_xl, 'xlLineStacked100', 
-                                 getattr(_xl, 'xlLineStacked', _xl.xlLine))
-                if 'stacked' in m:
-                    return getattr(_xl, 'xlLineStacked', _xl.xlLine)
-                return getattr(_xl, 'xlLine', getattr(_xl, 'xlLineMarkers', _xl.xlLine))
-            
-            if 'column' in ct:
-                if '100' in m:
-                    return getattr(_xl, 'xlColumnStacked100', 
-                                 getattr(_xl, 'xlColumnStacked', _xl.xlColumnClustered))
-                if 'stack' in m:
-                    return getattr(_xl, 'xlColumnStacked', _xl.xlColumnClustered)
-                return getattr(_xl, 'xlColumnClustered', _xl.xlColumnClustered)
-            
-            if 'bar' in ct:
-                if '100' in m:
-                    return getattr(_xl, 'xlBarStacked100', 
-                                 getattr(_xl, 'xlBarStacked', _xl.xlBarClustered))
-                if 'stack' in m:
-                    return getattr(_xl, 'xlBarStacked', _xl.xlBarClustered)
-                return getattr(_xl, 'xlBarClustered', _xl.xlBarClustered)
-            
-            if 'area' in ct:
-                if '100' in m:
-                    return getattr(_xl, 'xlAreaStacked100', 
-                                 getattr(_xl, 'xlAreaStacked', _xl.xlArea))
-                if 'stack' in m:
-                    return getattr(_xl, 'xlAreaStacked', _xl.xlArea)
-                return getattr(_xl, 'xlArea', _xl.xlArea)
-            
-            if 'pie' in ct:
-                if 'doughnut' in m:
-                    return getattr(_xl, 'xlDoughnut', _xl.xlPie)
-                if 'pie of' in m:
-                    return getattr(_xl, 'xlPieOfPie', _xl.xlPie)
-                return getattr(_xl, 'xlPie', _xl.xlPie)
-            
-            if 'scatter' in ct:
-                return getattr(_xl, 'xlXYScatter', _xl.xlXYScatter)
-            
-            if 'radar' in ct:
-                return getattr(_xl, 'xlRadar', _xl.xlRadar)
-                
-        except Exception:
-            pass
-        
-        # Fallback
-        return _xl.xlColumnClustered
+        return _chart_constant(chart_text.lower(), mode_text.lower() if mode_text else '')
     
     def get_last_chart(self):
         """Get the last created/modified chart object."""
         return self._last_chart
+    
+    def forget_last_chart(self):
+        """Drop the remembered chart so a stale COM reference is never reused."""
+        self._last_chart = None
@@ -3,11 +3,16 @@ Chart Controller for Peel Potato.
 Orchestrates services to handle chart creation and modification requests.
 Acts as the business logic layer between UI and services.
 """
+import sys
 from dataclasses import dataclass
 from typing import List, Optional, Any
 
 
-@dataclass
+# dataclass(slots=True) needs Python 3.10+; older interpreters keep a plain dataclass
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class ChartResult:
     """Result of a chart operation."""
     success: bool
@@ -18,20 +23,36 @@ class ChartResult:
     error_message: Optional[str] = None
 
 
+def _build_family(chart_type):
+    """Group chart types that share a series layout (scatter, pie, everything else)."""
+    chart_type_lower = chart_type.lower()
+    if 'scatter' in chart_type_lower:
+        return 'scatter'
+    if 'pie' in chart_type_lower:
+        return 'pie'
+    return 'standard'
+
+
 class ChartController:
     """Orchestrates chart creation and modification using various services."""
     
-    def __init__(self, excel_adapter, range_parser, chart_builder):
+    def __init__(self, excel_adapter, range_parser, chart_builder, log_names=True):
         """Initialize controller with required services.
         
         Args:
             excel_adapter: ExcelAdapter instance for Excel operations
             range_parser: RangeParser instance for range parsing
             chart_builder: ChartBuilder instance for chart creation
+            log_names: Add the detected dimension/value names to log_messages
         """
         self.excel = excel_adapter
         self.parser = range_parser
         self.builder = chart_builder
+        self._log_names_enabled = log_names
+        # Inputs and range bounds behind the last chart, so a type-only Change can skip the rebuild
+        self._last_build = None
+        # (workbook_name, sheet_name) from the most recent get_active_sheet_info poll
+        self._active_info = None
     
     def create_chart(self, dim_text, values_text, chart_type, multi_mode):
         """Create a new chart based on user inputs.
@@ -103,6 +124,9 @@ class ChartController:
             app_api, saved_state = self.excel.begin_performance_mode(sheet)
             
             try:
+                # Sheet geometry may have changed since the last operation
+                self.parser.reset_cache()
+                
                 # Parse dimension range
                 log_messages.append(f"Parsing dimension: {dim_text}")
                 dim_range = self.parser.parse_dim(dim_text, sheet)
@@ -111,8 +135,7 @@ class ChartController:
                 log_messages.append(f"Parsing values: {values_text}")
                 ref_rows = None
                 if dim_range is not None:
-                    dra = dim_range.api
-                    ref_rows = (dra.Row, dra.Row + dra.Rows.Count - 1)
+                    ref_rows = self.parser.range_bounds(dim_range)[:2]
                 
                 value_ranges = self.parser.parse_values(values_text, sheet, ref_rows=ref_rows)
                 log_messages.append(f"Found {len(value_ranges)} value range(s)")
@@ -124,37 +147,44 @@ class ChartController:
                         dim_text, sheet, value_ranges
                     )
                 
-                # Log detected names
-                if dim_range:
-                    try:
-                        import peel_potato_prettify
-                        dim_name = peel_potato_prettify.reset_title_name(dim_range)
-                        if dim_name:
-                            log_messages.append(f"✓ Dimension: <b>{dim_name}</b>")
-                    except Exception:
-                        pass
+                # Bounds of the freshly parsed ranges; built ranges answer from the parser's cache
+                signature = self._range_signature(dim_range, value_ranges)
+                
+                # Only the chart type/mode changed and the data still spans the same
+                # cells: re-type the chart, keep its series
+                if modify:
+                    result = self._try_retype(dim_text, values_text, chart_type, multi_mode,
+                                              dim_range, value_ranges, signature, log_messages)
+                    if result is not None:
+                        return result
                 
-                if value_ranges:
-                    try:
-                        import peel_potato_prettify
-                        for idx, vr in enumerate(value_ranges):
-                            value_name = peel_potato_prettify.reset_title_name(vr)
-                            if value_name:
-                                log_messages.append(f"  ✓ Value {idx+1}: <b>{value_name}</b>")
-                    except Exception:
-                        pass
+                # Full rebuild; a failure part-way must not leave stale retype inputs
+                self._last_build = None
                 
                 # Create/modify chart
                 action = "Modifying" if modify else "Creating"
                 log_messages.append(f"{action} {chart_type} chart...")
                 
+                # Side-by-side value columns (with their header row and the dimension
+                # column to their left) can be plotted with a single SetSourceData
+                source_block = None
+                chart_type_lower = chart_type.lower()
+                if 'scatter' not in chart_type_lower and 'pie' not in chart_type_lower:
+                    source_block = self.parser.contiguous_column_block(sheet, value_ranges, dim_range)
+                
                 chart, dim_name, value_names, builder_logs = self.builder.create(
-                    sheet, dim_range, value_ranges, chart_type, multi_mode, modify=modify
+                    sheet, dim_range, value_ranges, chart_type, multi_mode, modify=modify,
+                    source_block=source_block
                 )
                 
-                # Merge builder logs
+                # Log the names the formatter detected, then merge builder logs
+                self._log_names(dim_name, value_names, log_messages)
                 log_messages.extend(builder_logs)
                 
+                self._last_build = (
+                    self._active_info, dim_text, values_text, chart_type, multi_mode, signature,
+                )
+                
                 return ChartResult(
                     success=True,
                     chart=chart,
@@ -190,6 +220,77 @@ class ChartController:
                 error_message=f"Unexpected error: {str(e)}"
             )
     
+    def _log_names(self, dim_name, value_names, log_messages):
+        """Append the dimension and value header names found while formatting the chart."""
+        if not self._log_names_enabled:
+            return
+        
+        if dim_name:
+            log_messages.append(f"✓ Dimension: <b>{dim_name}</b>")
+        for idx, value_name in enumerate(value_names or []):
+            log_messages.append(f"  ✓ Value {idx+1}: <b>{value_name}</b>")
+    
+    def _range_signature(self, dim_range, value_ranges):
+        """Bounds of the dimension and value ranges, used to spot data that moved or resized."""
+        ranges = ([dim_range] if dim_range is not None else []) + list(value_ranges)
+        return tuple(self.parser.range_bounds(r) for r in ranges)
+    
+    def _try_retype(self, dim_text, values_text, chart_type, multi_mode,
+                    dim_range, value_ranges, signature, log_messages):
+        """Change only the last chart's type when the data inputs are unchanged.
+        
+        The ranges are re-parsed before this is called, so data that grew or
+        shrank since the last build changes the signature and forces a rebuild.
+        Pressing Change with identical settings also rebuilds, so it can be used
+        to refresh a chart after cell values changed. The workbook/sheet check
+        uses the poller's last reading rather than another COM query, so a
+        sheet switch made within one poll interval is not noticed.
+        
+        Args:
+            dim_text, values_text, chart_type, multi_mode: Current UI inputs
+            dim_range: Freshly parsed dimension range (or None)
+            value_ranges: Freshly parsed value ranges
+            signature: _range_signature of those ranges
+            log_messages: List to append log lines to
+        
+        Returns:
+            ChartResult on success, or None if a full rebuild is needed
+        """
+        last = self._last_build
+        if last is None:
+            return None
+        
+        last_info, last_dim, last_values, last_type, last_mode, last_signature = last
+        if (dim_text, values_text) != (last_dim, last_values):
+            return None
+        if (chart_type, multi_mode) == (last_type, last_mode):
+            return None
+        if _build_family(chart_type) != _build_family(last_type):
+            return None
+        if signature != last_signature or self._active_info != last_info:
+            return None
+        
+        try:
+            built = self.builder.retype(chart_type, multi_mode, dim_range, value_ranges)
+        except Exception:
+            built = None
+        if built is None:
+            return None
+        
+        chart, dim_name, value_names, builder_logs = built
+        self._log_names(dim_name, value_names, log_messages)
+        log_messages.extend(builder_logs)
+        self._last_build = (last_info, dim_text, values_text, chart_type, multi_mode, signature)
+        
+        return ChartResult(
+            success=True,
+            chart=chart,
+            dim_name=dim_name,
+            value_names=value_names,
+            log_messages=log_messages,
+            error_message=None
+        )
+    
     def validate_inputs(self, dim_text, values_text, chart_type):
         """Validate user inputs before processing.
         
@@ -222,7 +323,14 @@ class ChartController:
         Returns:
             tuple: (workbook_name, sheet_name) or (None, None) if no Excel
         """
-        return self.excel.get_active_workbook_info()
+        # Kept so chart operations can compare against it without another COM query
+        self._active_info = self.excel.get_active_workbook_info()
+        return self._active_info
+    
+    def forget_last_chart(self):
+        """Forget the last created chart (e.g., after the active workbook changed)."""
+        self.builder.forget_last_chart()
+        self._last_build = None
     
     def is_excel_available(self):
         """Check if Excel is available.
@@ -4,13 +4,153 @@ Handles parsing of Excel range specifications into xlwings Range objects.
 Consolidates all range parsing logic in one place.
 """
 import re
+from functools import lru_cache
+
+# A1-style column/range token: "B", "B2", "B:C", "B2:C9" (groups: col, row, col, row)
+_RANGE_RE = re.compile(r'^\s*([A-Z]+)(\d*)(?:\s*:\s*([A-Z]+)(\d*))?\s*$', re.IGNORECASE)
+
+# Cartesian product values spec: "(cols)*(rows)", e.g. "(B,E)*(2:7)"
+_CARTESIAN_RE = re.compile(r'\(([^)]+)\)\s*\*\s*\(([^)]+)\)')
+
+# Absolute single-area A1 address as returned by Range.Address, e.g. "$B$2:$D$10"
+_ADDRESS_RE = re.compile(r'^\$?([A-Z]+)\$?(\d+)(?::\$?([A-Z]+)\$?(\d+))?$')
+
+# Excel XlDirection.xlUp, used to find the end of a column's data
+_XL_UP = -4162
+
+
+
+@lru_cache(maxsize=2048)
+def _col_letter_to_index(letter):
+    """Convert an Excel column letter to its 1-based index (None if invalid)."""
+    letter = letter.strip().upper()
+    if not letter.isalpha():
+        return None
+    result = 0
+    for ch in letter:
+        result = result * 26 + (ord(ch) - ord('A') + 1)
+    return result
+
+
+@lru_cache(maxsize=2048)
+def _index_to_col_letter(idx):
+    """Convert a 1-based column index to its Excel column letter."""
+    col = ''
+    while idx > 0:
+        idx, remainder = divmod(idx - 1, 26)
+        col = chr(65 + remainder) + col
+    return col
+
+
+def _block_address(first_row, last_row, first_col, last_col):
+    """Build an A1 address like "B2:D10" so a block is one sheet.Range(address) call."""
+    return (f"{_index_to_col_letter(first_col)}{first_row}:"
+            f"{_index_to_col_letter(last_col)}{last_row}")
+
+
+def _parse_row_token(token):
+    """Parse a row number token, returning None if it isn't an integer."""
+    try:
+        return int(token)
+    except ValueError:
+        return None
+
+
+def _axis_spans(spec, parse_token):
+    """Yield inclusive (start, end) index spans from an axis spec like "B:D,F" or "2:5,9".
+    
+    Args:
+        spec: Comma-separated tokens, each a single item or an inclusive "start:end"
+        parse_token: Callable mapping one token to an int, or None if invalid
+        
+    Yields:
+        (start, end) tuples in spec order; invalid tokens and reversed spans are skipped
+    """
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        
+        if ':' in part:
+            bounds = part.split(':')
+            if len(bounds) != 2:
+                continue
+            start = parse_token(bounds[0].strip())
+            end = parse_token(bounds[1].strip())
+            if start is not None and end is not None and start <= end:
+                yield start, end
+        else:
+            idx = parse_token(part)
+            if idx is not None:
+                yield idx, idx
+
+
+def _expand_axis(spec, parse_token):
+    """Lazily expand an axis spec into 1-based indices (see _axis_spans)."""
+    for start, end in _axis_spans(spec, parse_token):
+        yield from range(start, end + 1)
+
+
+def _axis_bounds(spec, parse_token):
+    """Return (min, max) over an axis spec without expanding its spans, or None if empty."""
+    lo = hi = None
+    for start, end in _axis_spans(spec, parse_token):
+        if lo is None or start < lo:
+            lo = start
+        if hi is None or end > hi:
+            hi = end
+    return None if lo is None else (lo, hi)
+
+
+# Repeated Create/Change clicks re-send the same specs, so parse each string once
+@lru_cache(maxsize=256)
+def _column_indices(cols_str):
+    """Expand a column spec like "B:C,E" to a tuple of 1-based indices."""
+    return tuple(_expand_axis(cols_str, _col_letter_to_index))
+
+
+@lru_cache(maxsize=256)
+def _row_bounds(rows_str):
+    """Return (min, max) rows for a row spec like "2:7,9", or None if empty."""
+    return _axis_bounds(rows_str, _parse_row_token)
 
 
 class RangeParser:
     """Responsible for parsing range specifications and converting to xlwings Range objects."""
     
     def __init__(self):
-        self._cartesian_pattern = re.compile(r'\(([^)]+)\)\s*\*\s*\(([^)]+)\)')
+        # id(sheet) -> UsedRange bounds, valid for the current chart operation only
+        self._used_bounds = {}
+        # id(range) -> (range, bounds) for ranges this parser built from known rows/columns
+        self._built_bounds = {}
+    
+    def reset_cache(self):
+        """Forget cached sheet geometry; call at the start of each chart operation."""
+        self._used_bounds.clear()
+        self._built_bounds.clear()
+    
+    def used_range_bounds(self, sheet):
+        """Get the sheet's UsedRange bounds, reading them from Excel once per operation.
+        
+        Args:
+            sheet: xlwings Sheet object
+            
+        Returns:
+            tuple: (first_row, last_row, first_col, last_col), or None if unavailable
+        """
+        key = id(sheet)
+        if key not in self._used_bounds:
+            try:
+                used = sheet.api.UsedRange
+                first_row = int(used.Row)
+                first_col = int(used.Column)
+                self._used_bounds[key] = (
+                    first_row, first_row + int(used.Rows.Count) - 1,
+                    first_col, first_col + int(used.Columns.Count) - 1,
+                )
+            except Exception:
+                self._used_bounds[key] = None
+        return self._used_bounds[key]
     
     def parse_dim(self, dim_text, sheet):
         """Parse dimension (X-axis/category) range.
@@ -27,15 +167,16 @@ class RangeParser:
         
         dim_text = dim_text.strip()
         
-        # If contains digits or colon, treat as explicit range
-        if any(ch.isdigit() for ch in dim_text) or ':' in dim_text:
-            try:
-                return sheet.range(dim_text)
-            except Exception:
-                return None
+        # A bare column letter will be expanded later with ref_rows
+        m = _RANGE_RE.match(dim_text)
+        if m is not None and not m.group(2) and m.group(3) is None:
+            return None
         
-        # Otherwise, it's just a column letter - will be expanded later with ref_rows
-        return None
+        # Anything else (row numbers or a colon) is an explicit range
+        try:
+            return sheet.range(dim_text)
+        except Exception:
+            return None
     
     def parse_values(self, values_text, sheet, ref_rows=None):
         """Parse values input into list of xlwings Range objects.
@@ -59,7 +200,7 @@ class RangeParser:
             return []
         
         # Check for Cartesian product format: (cols)*(rows)
-        cartesian_match = self._cartesian_pattern.match(values_text)
+        cartesian_match = _CARTESIAN_RE.match(values_text)
         if cartesian_match:
             return self._parse_cartesian(cartesian_match, sheet)
         
@@ -71,24 +212,21 @@ class RangeParser:
         cols_str = match.group(1).strip()
         rows_str = match.group(2).strip()
         
-        # Expand columns
-        cols = self.expand_column_range(cols_str)
+        # Expand columns straight to indices (no letter round-trip)
+        col_indices = _column_indices(cols_str)
         
-        # Expand rows
-        rows = self._expand_row_range(rows_str)
+        # Only the outer row bounds matter, so don't materialise every row
+        row_bounds = _row_bounds(rows_str)
         
         # Build ranges for each column-row combination
-        if not cols or not rows:
+        if not col_indices or row_bounds is None:
             return []
         
+        start_row, end_row = row_bounds
         ranges = []
-        for col in cols:
+        for col_idx in col_indices:
             try:
-                col_idx = self.col_letter_to_index(col)
-                if col_idx:
-                    start_row = min(rows)
-                    end_row = max(rows)
-                    ranges.append(sheet.range((start_row, col_idx), (end_row, col_idx)))
+                ranges.append(self._column_range(sheet, col_idx, start_row, end_row))
             except Exception:
                 pass
         
@@ -100,19 +238,20 @@ class RangeParser:
         ranges = []
         
         # Get used range info for default row ranges
-        try:
-            used = sheet.api.UsedRange
-            header_row = int(used.Row)
+        used_bounds = self.used_range_bounds(sheet)
+        if used_bounds is not None:
+            header_row, used_end = used_bounds[0], used_bounds[1]
             data_start = header_row + 1
-            used_end = int(used.Row + used.Rows.Count - 1)
-        except Exception:
+        else:
             header_row = None
             data_start = None
             used_end = None
         
         for p in parts:
-            # Explicit range with row numbers (e.g., B2:B5)
-            if any(ch.isdigit() for ch in p):
+            m = _RANGE_RE.match(p)
+            
+            # Explicit range with row numbers (e.g., B2:B5) or anything else Excel may resolve
+            if m is None or m.group(2) or m.group(4):
                 try:
                     ranges.append(sheet.range(p))
                 except Exception:
@@ -120,25 +259,23 @@ class RangeParser:
                 continue
             
             # Column span (e.g., B:C)
-            if ':' in p:
-                left, right = [x.strip() for x in p.split(':', 1)]
-                if left.isalpha() and right.isalpha() and data_start is not None and used_end is not None:
-                    left_idx = self.col_letter_to_index(left)
-                    right_idx = self.col_letter_to_index(right)
+            if m.group(3) is not None:
+                if data_start is not None and used_end is not None:
+                    left_idx = self.col_letter_to_index(m.group(1))
+                    right_idx = self.col_letter_to_index(m.group(3))
                     if left_idx and right_idx and left_idx <= right_idx:
                         for col in range(left_idx, right_idx + 1):
                             try:
-                                ranges.append(sheet.range((data_start, col), (used_end, col)))
+                                ranges.append(self._column_range(sheet, col, data_start, used_end))
                             except Exception:
                                 pass
-                    continue
                 else:
                     # Try as explicit range
                     try:
                         ranges.append(sheet.range(p))
                     except Exception:
                         pass
-                    continue
+                continue
             
             # Single column letter (e.g., B)
             col_idx = self.col_letter_to_index(p)
@@ -147,14 +284,34 @@ class RangeParser:
             
             if ref_rows:
                 start_row, end_row = ref_rows
-                ranges.append(sheet.range((start_row, col_idx), (end_row, col_idx)))
+                ranges.append(self._column_range(sheet, col_idx, start_row, end_row))
             elif data_start is not None and used_end is not None:
-                ranges.append(sheet.range((data_start, col_idx), (used_end, col_idx)))
+                ranges.append(self._column_range(sheet, col_idx, data_start, used_end))
             else:
-                ranges.append(sheet.range((2, col_idx), (10000, col_idx)))
+                ranges.append(self._column_range(sheet, col_idx, 2, self._last_data_row(sheet, col_idx)))
         
         return ranges
     
+    def _column_range(self, sheet, col_idx, start_row, end_row):
+        """Get one column's rows as a Range via its A1 address.
+        
+        An address string is a single Range(address) call, whereas
+        sheet.range((r1, c), (r2, c)) resolves both corners with Cells first.
+        """
+        rng = sheet.range(_block_address(start_row, end_row, col_idx, col_idx))
+        # Geometry is known here, so range_bounds never has to ask Excel for it
+        self._built_bounds[id(rng)] = (rng, (start_row, end_row, col_idx, col_idx))
+        return rng
+    
+    def _last_data_row(self, sheet, col_idx):
+        """Find the last non-empty row in a column (Ctrl+Up from the bottom of the sheet)."""
+        try:
+            api = sheet.api
+            last_row = api.Cells(api.Rows.Count, col_idx).End(_XL_UP).Row
+            return max(2, int(last_row))
+        except Exception:
+            return 10000
+    
     def compute_source_block(self, sheet, ranges_list):
         """Compute a combined source COM Range covering all ranges in the list.
         
@@ -168,7 +325,6 @@ class RangeParser:
         if not ranges_list:
             return None
         
-        api = sheet.api
         min_row = None
         max_row = None
         min_col = None
@@ -176,15 +332,7 @@ class RangeParser:
         
         for r in ranges_list:
             try:
-                ra = r.api
-                r_row = ra.Row
-                r_rows = ra.Rows.Count
-                r_col = ra.Column
-                r_cols = ra.Columns.Count
-                r_min_row = r_row
-                r_max_row = r_row + r_rows - 1
-                r_min_col = r_col
-                r_max_col = r_col + r_cols - 1
+                r_min_row, r_max_row, r_min_col, r_max_col = self.range_bounds(r)
                 
                 if min_row is None or r_min_row < min_row:
                     min_row = r_min_row
@@ -200,7 +348,82 @@ class RangeParser:
         if min_row is None:
             return None
         
-        return api.Range(api.Cells(min_row, min_col), api.Cells(max_row, max_col))
+        return sheet.api.Range(_block_address(min_row, max_row, min_col, max_col))
+    
+    def contiguous_column_block(self, sheet, ranges_list, dim_range=None):
+        """Combine single-column ranges, their header row and the dimension into one COM Range.
+        
+        The value ranges must each be one column wide, cover the same rows and
+        appear in left-to-right column order. The block adds the header row
+        above them and, when given, the dimension column directly to their
+        left, so that plotting it by columns lets Excel take the categories and
+        series names from the block itself.
+        
+        Args:
+            sheet: xlwings Sheet object
+            ranges_list: List of xlwings Range objects
+            dim_range: Optional xlwings Range for the dimension column
+            
+        Returns:
+            COM Range object covering header, dimension and values, or None if
+            they don't form one block
+        """
+        if not ranges_list:
+            return None
+        
+        try:
+            bounds = [self.range_bounds(r) for r in ranges_list]
+            dim_bounds = self.range_bounds(dim_range) if dim_range is not None else None
+        except Exception:
+            return None
+        
+        first_row, last_row, first_col, _ = bounds[0]
+        # Series names come from the row above the data
+        if first_row < 2:
+            return None
+        for offset, (r_min_row, r_max_row, r_min_col, r_max_col) in enumerate(bounds):
+            if (r_min_row != first_row or r_max_row != last_row
+                    or r_min_col != r_max_col or r_min_col != first_col + offset):
+                return None
+        
+        if dim_bounds is not None:
+            if dim_bounds != (first_row, last_row, first_col - 1, first_col - 1):
+                return None
+            first_col -= 1
+        
+        return sheet.api.Range(_block_address(first_row - 1, last_row, first_col, bounds[-1][3]))
+    
+    def range_bounds(self, r):
+        """Get the bounding rows/columns of an xlwings Range.
+        
+        Args:
+            r: xlwings Range object
+            
+        Returns:
+            tuple: (min_row, max_row, min_col, max_col), 1-based and inclusive
+        """
+        built = self._built_bounds.get(id(r))
+        if built is not None and built[0] is r:
+            return built[1]
+        
+        ra = r.api
+        # One Address read instead of Row/Column/Rows.Count/Columns.Count
+        try:
+            m = _ADDRESS_RE.match(ra.Address)
+        except Exception:
+            m = None
+        if m is not None:
+            first_col, first_row, last_col, last_row = m.groups()
+            first_col = _col_letter_to_index(first_col)
+            first_row = int(first_row)
+            if last_col is None:
+                return first_row, first_row, first_col, first_col
+            return first_row, int(last_row), first_col, _col_letter_to_index(last_col)
+        
+        # Whole rows/columns or multi-area ranges: fall back to the geometry properties
+        r_row = ra.Row
+        r_col = ra.Column
+        return r_row, r_row + ra.Rows.Count - 1, r_col, r_col + ra.Columns.Count - 1
     
     def col_letter_to_index(self, letter):
         """Convert Excel column letter to 1-based index.
@@ -213,13 +436,7 @@ class RangeParser:
         """
         if letter is None:
             return None
-        letter = letter.strip().upper()
-        if not letter.isalpha():
-            return None
-        result = 0
-        for ch in letter:
-            result = result * 26 + (ord(ch) - ord('A') + 1)
-        return result
+        return _col_letter_to_index(letter)
     
     def expand_column_range(self, cols_str):
         """Expand column specification into list of column letters.
@@ -236,89 +453,30 @@ class RangeParser:
         Returns:
             List of uppercase column letters
         """
-        if not cols_str:
-            return []
+        return [_index_to_col_letter(i) for i in self.expand_column_indices(cols_str)]
+    
+    def expand_column_indices(self, cols_str):
+        """Expand column specification into list of 1-based column indices.
         
-        cols = []
-        cols_str = cols_str.strip().upper()
-        
-        # Continuous range like B:E (no comma)
-        if ':' in cols_str and ',' not in cols_str:
-            parts = [p.strip() for p in cols_str.split(':')]
-            if len(parts) == 2:
-                start_idx = self.col_letter_to_index(parts[0])
-                end_idx = self.col_letter_to_index(parts[1])
-                if start_idx and end_idx and start_idx <= end_idx:
-                    for i in range(start_idx, end_idx + 1):
-                        cols.append(self._index_to_col_letter(i))
-            return cols
-        
-        # Comma-separated parts
-        for part in cols_str.split(','):
-            part = part.strip()
-            if not part:
-                continue
-            
-            if ':' in part:
-                # Sub-range within comma list
-                sub = [s.strip() for s in part.split(':')]
-                if len(sub) == 2:
-                    s_idx = self.col_letter_to_index(sub[0])
-                    e_idx = self.col_letter_to_index(sub[1])
-                    if s_idx and e_idx and s_idx <= e_idx:
-                        for i in range(s_idx, e_idx + 1):
-                            cols.append(self._index_to_col_letter(i))
-            else:
-                if part.isalpha():
-                    cols.append(part)
+        Accepts the same formats as expand_column_range, e.g. "B:C,E" → [2, 3, 5].
         
-        return cols
+        Args:
+            cols_str: String specification
+            
+        Returns:
+            List of 1-based column indices
+        """
+        if not cols_str:
+            return []
+        return list(_column_indices(cols_str))
     
     def _expand_row_range(self, rows_str):
         """Expand row specification into list of row numbers."""
-        rows = []
-        
-        # Continuous range like 2:7 (no comma)
-        if ':' in rows_str and ',' not in rows_str:
-            parts = rows_str.split(':')
-            try:
-                start_row = int(parts[0].strip())
-                end_row = int(parts[1].strip())
-                rows = list(range(start_row, end_row + 1))
-            except Exception:
-                pass
-            return rows
-        
-        # Comma-separated parts
-        for part in rows_str.split(','):
-            part = part.strip()
-            if not part:
-                continue
-            
-            if ':' in part:
-                # Sub-range within comma list
-                row_parts = part.split(':')
-                try:
-                    start_row = int(row_parts[0].strip())
-                    end_row = int(row_parts[1].strip())
-                    rows.extend(range(start_row, end_row + 1))
-                except Exception:
-                    pass
-            else:
-                try:
-                    rows.append(int(part))
-                except Exception:
-                    pass
-        
-        return rows
+        return list(_expand_axis(rows_str, _parse_row_token))
     
     def _index_to_col_letter(self, idx):
         """Convert 1-based column index to Excel column letter."""
-        col = ''
-        while idx > 0:
-            idx, remainder = divmod(idx - 1, 26)
-            col = chr(65 + remainder) + col
-        return col
+        return _index_to_col_letter(idx)
     
     def infer_dim_range_from_column(self, dim_text, sheet, value_ranges):
         """Infer dim range when only a column letter is provided.
@@ -340,11 +498,10 @@ class RangeParser:
         ref_rows = None
         try:
             if value_ranges:
-                vr0 = value_ranges[0].api
-                ref_rows = (vr0.Row, vr0.Row + vr0.Rows.Count - 1)
+                ref_rows = self.range_bounds(value_ranges[0])[:2]
             else:
-                used = sheet.api.UsedRange
-                ref_rows = (used.Row, used.Row + used.Rows.Count - 1)
+                used_bounds = self.used_range_bounds(sheet)
+                ref_rows = used_bounds[:2] if used_bounds else None
         except Exception:
             ref_rows = None
         
@@ -356,6 +513,6 @@ class RangeParser:
             return None
         
         try:
-            return sheet.range((ref_rows[0], col_idx), (ref_rows[1], col_idx))
+            return self._column_range(sheet, col_idx, ref_rows[0], ref_rows[1])
         except Exception:
             return None
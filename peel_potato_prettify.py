@@ -9,6 +9,23 @@ except Exception:
     xlconst = None
 
 
+def _xl_const(name, default):
+    """Resolve an Excel constant once, falling back to its documented value."""
+    if xlconst is None:
+        return default
+    try:
+        return getattr(xlconst, name)
+    except AttributeError:
+        return default
+
+
+# Excel constants used on every format pass, resolved once at import
+_XL_LEGEND_TOP = _xl_const('xlLegendPositionTop', -4160)
+_XL_LABEL_ABOVE = _xl_const('xlLabelPositionAbove', 0)
+_XL_CATEGORY = _xl_const('xlCategory', 1)
+_XL_VALUE = _xl_const('xlValue', 2)
+
+
 def apply_chart_formatting(chart, dim_range=None, value_ranges=None):
     """Apply default formatting to charts:
     1) Legend on, position at top
@@ -23,13 +40,6 @@ def apply_chart_formatting(chart, dim_range=None, value_ranges=None):
     value_names = []
     
     try:
-        # Ensure win32 constants available
-        if xlconst is None:
-            from win32com.client import constants as xlconst_local
-            _xl = xlconst_local
-        else:
-            _xl = xlconst
-
         # Set chart title: "Value" by Dim with left/top positioning
         try:
             dim_name = reset_title_name(dim_range) if dim_range else None
@@ -58,57 +68,57 @@ def apply_chart_formatting(chart, dim_range=None, value_ranges=None):
         # 1) Legend: on and position at top
         try:
             chart.HasLegend = True
-            chart.Legend.Position = _xl.xlLegendPositionTop
+            legend = chart.Legend
+            legend.Position = _XL_LEGEND_TOP
             # Set legend font
-            chart.Legend.Font.Size = 12
-            chart.Legend.Font.Name = "Microsoft YaHei UI"
+            font = legend.Font
+            font.Size = 12
+            font.Name = "Microsoft YaHei UI"
         except Exception:
             pass
 
-        # 2) Data labels: on, above, number format 0.0
+        # 2) Data labels: on, above, number format 0.0 (one pass per series,
+        #    reusing the collection, label and font handles)
         try:
-            series_count = chart.SeriesCollection().Count
-            for i in range(1, series_count + 1):  # COM collections are 1-indexed
+            series_coll = chart.SeriesCollection()
+            for i in range(1, series_coll.Count + 1):  # COM collections are 1-indexed
                 try:
-                    series = chart.SeriesCollection(i)
+                    series = series_coll(i)
                     series.HasDataLabels = True
-                except Exception:
-                    pass
-            
-            # Apply formatting after all series have labels enabled
-            for i in range(1, series_count + 1):
-                try:
-                    series = chart.SeriesCollection(i)
                     datalabels = series.DataLabels()
-                    datalabels.Position = _xl.xlLabelPositionAbove
+                    datalabels.Position = _XL_LABEL_ABOVE
                     datalabels.NumberFormat = "0.0"
-                    datalabels.Font.Size = 12
-                    datalabels.Font.Name = "Microsoft YaHei UI"
-                except Exception as e:
+                    font = datalabels.Font
+                    font.Size = 12
+                    font.Name = "Microsoft YaHei UI"
+                except Exception:
                     pass
-        except Exception as e:
+        except Exception:
             pass
 
         # 3) Chart title font
         try:
             if chart.HasTitle:
-                chart.ChartTitle.Font.Size = 12
-                chart.ChartTitle.Font.Name = "Microsoft YaHei UI"
+                font = chart.ChartTitle.Font
+                font.Size = 12
+                font.Name = "Microsoft YaHei UI"
         except Exception:
             pass
 
-        # Axes fonts (if applicable)
+        # Axes fonts (if applicable); each axis' tick-label font is fetched once
         try:
             # Category axis
-            chart.Axes(_xl.xlCategory).TickLabels.Font.Size = 12
-            chart.Axes(_xl.xlCategory).TickLabels.Font.Name = "Microsoft YaHei UI"
+            font = chart.Axes(_XL_CATEGORY).TickLabels.Font
+            font.Size = 12
+            font.Name = "Microsoft YaHei UI"
         except Exception:
             pass
 
         try:
             # Value axis
-            chart.Axes(_xl.xlValue).TickLabels.Font.Size = 12
-            chart.Axes(_xl.xlValue).TickLabels.Font.Name = "Microsoft YaHei UI"
+            font = chart.Axes(_XL_VALUE).TickLabels.Font
+            font.Size = 12
+            font.Name = "Microsoft YaHei UI"
         except Exception:
             pass
 
@@ -136,15 +146,21 @@ def reset_title_name(cell_range):
         # Get the worksheet
         worksheet = range_api.Worksheet
         
-        # Search from row 1 downward until we find a string
+        # Headers usually sit in row 1, so check that cell before a bulk read
+        cell_value = worksheet.Cells(1, first_col).Value
+        if isinstance(cell_value, str) and cell_value.strip():
+            return cell_value.strip()
+        
+        # Search further down until we find a string; the rest of the column is
+        # read in one Value call (a tuple of 1-tuples) and scanned in Python
         max_search_rows = 100  # Reasonable limit to avoid searching entire sheet
-        for row_num in range(1, max_search_rows + 1):
-            try:
-                cell_value = worksheet.Cells(row_num, first_col).Value
-                if isinstance(cell_value, str) and cell_value.strip():
-                    return cell_value.strip()
-            except Exception:
-                continue
+        values = worksheet.Range(
+            worksheet.Cells(2, first_col), worksheet.Cells(max_search_rows, first_col)
+        ).Value
+        for row in values:
+            cell_value = row[0] if isinstance(row, tuple) else row
+            if isinstance(cell_value, str) and cell_value.strip():
+                return cell_value.strip()
         
         return None
     except Exception:
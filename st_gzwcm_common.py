@@ -0,0 +1,118 @@
+"""
+ST_GZWCM Common - Shared Excel helpers for SLC, Sum and Info.
+Single home for the performance-mode toggles, sheet-name rules, lookup-file
+caching and output writing the tools share.
+"""
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+
+# Excel's xlCalculationManual
+XL_CALCULATION_MANUAL = -4135
+
+# Characters Excel forbids in sheet names, compiled once
+SHEET_NAME_INVALID = re.compile(r'[:\\/*?\[\]]')
+
+
+def sanitize_sheet_name(name, suffix=''):
+    """Sanitize sheet name to comply with Excel restrictions.
+    
+    Args:
+        name: Original sheet name
+        suffix: Suffix to add (e.g., '_slc' or '_filtered')
+    
+    Returns:
+        Valid Excel sheet name (max 31 chars, no invalid chars)
+    """
+    # Remove invalid characters: : \ / ? * [ ]
+    clean_name = SHEET_NAME_INVALID.sub('_', str(name))
+    
+    # Add suffix
+    full_name = f"{clean_name}{suffix}"
+    
+    # Limit to 31 characters
+    if len(full_name) > 31:
+        # Keep as much of the original name as possible
+        max_base_len = 31 - len(suffix)
+        full_name = f"{clean_name[:max_base_len]}{suffix}"
+    
+    return full_name
+
+
+def begin_performance_mode(app):
+    """Turn off screen updating, alerts and automatic calculation for a bulk write.
+    
+    Args:
+        app: xlwings App object
+    
+    Returns:
+        tuple: (app_api, saved_state_dict) for end_performance_mode
+    """
+    app_api = app.api
+    saved = {}
+    for name, value in (('ScreenUpdating', False), ('DisplayAlerts', False),
+                        ('Calculation', XL_CALCULATION_MANUAL)):
+        try:
+            saved[name] = getattr(app_api, name)
+            setattr(app_api, name, value)
+        except Exception:
+            pass
+    return app_api, saved
+
+
+def end_performance_mode(app_api, saved):
+    """Restore the settings saved by begin_performance_mode."""
+    for name, value in saved.items():
+        try:
+            setattr(app_api, name, value)
+        except Exception:
+            pass
+
+
+def frame_block(df):
+    """Build a header-plus-rows object array for a single Range.Value write.
+    
+    Args:
+        df: DataFrame to write
+    
+    Returns:
+        numpy object array of shape (len(df) + 1, len(df.columns))
+    """
+    # Object dtype keeps strings such as zero-padded emp_id intact
+    block = np.empty((len(df) + 1, len(df.columns)), dtype=object)
+    block[0] = list(df.columns)
+    block[1:] = df.to_numpy(dtype=object)
+    return block
+
+
+# (path, sheet, mtime_ns, size) -> parsed sheet; a changed file gets a new key
+_SHEET_CACHE = {}
+
+
+def read_cached_sheet(path, sheet_name):
+    """Read a lookup sheet (dict or emp) with pd.read_excel, parsing each file version once.
+    
+    Callers get a copy, so modifying the returned frame never touches the cache.
+    
+    Args:
+        path: Path to the .xlsx file
+        sheet_name: Worksheet name
+    
+    Returns:
+        tuple: (DataFrame, cached) where cached is True if no Excel parsing was needed
+    """
+    st = os.stat(path)
+    key = (path, sheet_name, st.st_mtime_ns, st.st_size)
+    df = _SHEET_CACHE.get(key)
+    if df is not None:
+        return df.copy(), True
+    
+    df = pd.read_excel(path, sheet_name=sheet_name)
+    # Drop entries for older versions of this sheet
+    for stale in [k for k in _SHEET_CACHE if k[:2] == key[:2]]:
+        del _SHEET_CACHE[stale]
+    _SHEET_CACHE[key] = df
+    return df.copy(), False
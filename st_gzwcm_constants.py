@@ -14,3 +14,9 @@ DATE_COLUMN_NAMES = ['date', 'data_dt', 'dt_date', 'dt', 'datetime', '日期', '
 
 # Common group column name variations
 GRP_COLUMN_NAMES = ['grp', 'group', 'team', '组', '小组']
+
+# Lowercased forms of the lists above, for case-insensitive header matching
+EMP_NAME_COLUMN_KEYS = frozenset(name.lower() for name in EMP_NAME_COLUMN_NAMES)
+EMP_ID_COLUMN_KEYS = frozenset(name.lower() for name in EMP_ID_COLUMN_NAMES)
+DATE_COLUMN_KEYS = frozenset(name.lower() for name in DATE_COLUMN_NAMES)
+GRP_COLUMN_KEYS = frozenset(name.lower() for name in GRP_COLUMN_NAMES)
@@ -16,6 +16,7 @@ import pandas as pd
 
 # Import shared constants
 from st_gzwcm_constants import EMP_NAME_COLUMN_NAMES, EMP_ID_COLUMN_NAMES, DATE_COLUMN_NAMES, GRP_COLUMN_NAMES
+from st_gzwcm_common import begin_performance_mode, end_performance_mode, frame_block, read_cached_sheet
 
 
 def load_employee_info(logger=None):
@@ -50,9 +51,12 @@ def load_employee_info(logger=None):
     if os.path.exists(emp_file):
         log(f"[DEBUG] Found emp file: {emp_file}")
         try:
-            df = pd.read_excel(emp_file, sheet_name='emp')
-            log(f"[DEBUG] Loaded emp.xlsx successfully. Shape: {df.shape}")
-            log(f"[DEBUG] Columns: {list(df.columns)}")
+            df, cached = read_cached_sheet(emp_file, 'emp')
+            if cached:
+                log(f"[DEBUG] Using cached emp.xlsx (file unchanged). Shape: {df.shape}")
+            else:
+                log(f"[DEBUG] Loaded emp.xlsx successfully. Shape: {df.shape}")
+                log(f"[DEBUG] Columns: {list(df.columns)}")
             return df
         except Exception as e:
             raise Exception(f"Error loading emp.xlsx: {e}")
@@ -61,9 +65,12 @@ def load_employee_info(logger=None):
     if os.path.exists(emp_embed_file):
         log(f"[DEBUG] Found embedded emp file: {emp_embed_file}")
         try:
-            df = pd.read_excel(emp_embed_file, sheet_name='emp')
-            log(f"[DEBUG] Loaded emp_embed.xlsx successfully. Shape: {df.shape}")
-            log(f"[DEBUG] Columns: {list(df.columns)}")
+            df, cached = read_cached_sheet(emp_embed_file, 'emp')
+            if cached:
+                log(f"[DEBUG] Using cached emp_embed.xlsx (file unchanged). Shape: {df.shape}")
+            else:
+                log(f"[DEBUG] Loaded emp_embed.xlsx successfully. Shape: {df.shape}")
+                log(f"[DEBUG] Columns: {list(df.columns)}")
             return df
         except Exception as e:
             raise Exception(f"Error loading emp_embed.xlsx: {e}")
@@ -88,8 +95,9 @@ def find_column(df, column_name_list, logger=None):
         else:
             print(msg)
     
+    names_lower = frozenset(name.lower() for name in column_name_list)
     for col in df.columns:
-        if col and str(col).lower() in [name.lower() for name in column_name_list]:
+        if col and str(col).lower() in names_lower:
             log(f"[DEBUG] Found column '{col}' matching {column_name_list}")
             return col
     return None
@@ -169,7 +177,6 @@ def info(logger=None):
             raise Exception(f"Employee info file does not have matching {key_type} column")
         
         # Standardize column names in emp_info for merging
-        emp_info_renamed = emp_info.copy()
         rename_dict = {}
         if emp_info_nm_col:
             rename_dict[emp_info_nm_col] = 'emp_nm'
@@ -177,22 +184,23 @@ def info(logger=None):
             rename_dict[emp_info_id_col] = 'emp_id'
         if emp_info_grp_col:
             rename_dict[emp_info_grp_col] = 'grp'
-        emp_info_renamed = emp_info_renamed.rename(columns=rename_dict)
+        # rename returns a new frame, so the cached emp_info is never modified
+        emp_info_renamed = emp_info.rename(columns=rename_dict)
         
         # Convert emp_id to string and pad to 8 digits with leading zeros in emp_info
         if 'emp_id' in emp_info_renamed.columns:
             emp_info_renamed['emp_id'] = emp_info_renamed['emp_id'].astype(str).str.zfill(8)
         
         # Merge data based on key column
-        df_renamed = df.copy()
+        df_renamed = df
         
         # Keep track of original emp_id if exists in active sheet
         has_original_emp_id = sheet_emp_id_col is not None
         if has_original_emp_id and sheet_emp_id_col in df_renamed.columns:
-            # Convert and format original emp_id
-            df_renamed['emp_id_original'] = df_renamed[sheet_emp_id_col].astype(str).str.zfill(8)
+            # Convert and format original emp_id; assign returns a new frame, leaving df as read
+            df_renamed = df_renamed.assign(emp_id_original=df_renamed[sheet_emp_id_col].astype(str).str.zfill(8))
         
-        # Rename key column for merging
+        # Rename key column for merging (returns a new frame)
         df_renamed = df_renamed.rename(columns={key_col: key_type})
         
         # Convert emp_id to string and pad to 8 digits with leading zeros in active sheet (for merging)
@@ -242,17 +250,10 @@ def info(logger=None):
             merged_df = merged_df.rename(columns={date_col: 'data_dt'})
         
         # Rearrange columns: data_dt (if exists), grp, emp_id, emp_nm, others
-        priority_cols = []
-        if 'data_dt' in merged_df.columns:
-            priority_cols.append('data_dt')
-        if 'grp' in merged_df.columns:
-            priority_cols.append('grp')
-        if 'emp_id' in merged_df.columns:
-            priority_cols.append('emp_id')
-        if 'emp_nm' in merged_df.columns:
-            priority_cols.append('emp_nm')
+        priority_cols = [c for c in ('data_dt', 'grp', 'emp_id', 'emp_nm') if c in merged_df.columns]
         
-        other_cols = [c for c in merged_df.columns if c not in priority_cols]
+        priority_set = set(priority_cols)
+        other_cols = [c for c in merged_df.columns if c not in priority_set]
         merged_df = merged_df[priority_cols + other_cols]
         
         # Ensure emp_id is string and padded to 8 digits in final output
@@ -263,37 +264,33 @@ def info(logger=None):
         # Create new sheet with enriched data
         new_sheet_name = 'info'
         
-        # Remove existing sheet with the same name if it exists
+        # No redraws or recalculation while the output sheet is rebuilt
+        app_api, saved_state = begin_performance_mode(app)
         try:
-            if new_sheet_name in [s.name for s in wb.sheets]:
+            # Remove existing sheet with the same name; a missing sheet just raises
+            try:
                 wb.sheets[new_sheet_name].delete()
-        except Exception:
-            pass
-        
-        # Create new sheet
-        new_sheet = wb.sheets.add(name=new_sheet_name, after=sheet)
-        
-        # Write headers
-        new_sheet.range('A1').value = merged_df.columns.tolist()
-        
-        # Pre-format emp_id column as text before writing data
-        if not merged_df.empty and 'emp_id' in merged_df.columns:
-            emp_id_col_idx = merged_df.columns.tolist().index('emp_id') + 1  # 1-based
-            emp_id_col_letter = chr(64 + emp_id_col_idx) if emp_id_col_idx <= 26 else 'A' + chr(64 + emp_id_col_idx - 26)
-            last_row = len(merged_df) + 1
-            emp_id_range = new_sheet.range(f'{emp_id_col_letter}2:{emp_id_col_letter}{last_row}')
-            emp_id_range.number_format = '@'  # Set as text format first
-        
-        # Write data in bulk (convert DataFrame to list to preserve strings)
-        if not merged_df.empty:
-            # Convert to list of lists to preserve data types
-            data_to_write = []
-            for _, row in merged_df.iterrows():
-                data_to_write.append(row.tolist())
-            new_sheet.range('A2').value = data_to_write
-        
-        # Auto-fit columns
-        new_sheet.autofit()
+            except Exception:
+                pass
+            
+            # Create new sheet
+            new_sheet = wb.sheets.add(name=new_sheet_name, after=sheet)
+            
+            # Pre-format emp_id column as text before writing data
+            if not merged_df.empty and 'emp_id' in merged_df.columns:
+                emp_id_col_idx = merged_df.columns.get_loc('emp_id') + 1  # 1-based
+                last_row = len(merged_df) + 1
+                emp_id_range = new_sheet.range((2, emp_id_col_idx), (last_row, emp_id_col_idx))
+                emp_id_range.number_format = '@'  # Set as text format first
+            
+            # Write headers and data with one sized Range.Value set
+            block = frame_block(merged_df)
+            new_sheet.range((1, 1), block.shape).value = block
+            
+            # Auto-fit column widths only; rows of plain values keep the default height
+            new_sheet.autofit('columns')
+        finally:
+            end_performance_mode(app_api, saved_state)
         
         return f"✓ Created sheet '{new_sheet_name}' with {len(merged_df)} records enriched with employee info"
         
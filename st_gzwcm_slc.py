@@ -4,7 +4,6 @@ Loads dict.xlsx (or dict_embed.xlsx as fallback) and filters/renames columns in
 """
 import os
 import sys
-import re
 
 # Initialize pywin32 for frozen exe
 if getattr(sys, 'frozen', False):
@@ -15,32 +14,12 @@ import xlwings as xw
 import pandas as pd
 
 # Import shared constants
-from st_gzwcm_constants import EMP_NAME_COLUMN_NAMES, EMP_ID_COLUMN_NAMES, DATE_COLUMN_NAMES, GRP_COLUMN_NAMES
-
-
-def sanitize_sheet_name(name, suffix=''):
-    """Sanitize sheet name to comply with Excel restrictions.
-    
-    Args:
-        name: Original sheet name
-        suffix: Suffix to add (e.g., '_slc')
-    
-    Returns:
-        Valid Excel sheet name (max 31 chars, no invalid chars)
-    """
-    # Remove invalid characters: : \ / ? * [ ]
-    clean_name = re.sub(r'[:\\/*?\[\]]', '_', str(name))
-    
-    # Add suffix
-    full_name = f"{clean_name}{suffix}"
-    
-    # Limit to 31 characters
-    if len(full_name) > 31:
-        # Keep as much of the original name as possible
-        max_base_len = 31 - len(suffix)
-        full_name = f"{clean_name[:max_base_len]}{suffix}"
-    
-    return full_name
+from st_gzwcm_constants import (
+    EMP_NAME_COLUMN_KEYS, EMP_ID_COLUMN_KEYS, DATE_COLUMN_KEYS, GRP_COLUMN_KEYS,
+)
+from st_gzwcm_common import (
+    begin_performance_mode, end_performance_mode, frame_block, read_cached_sheet,
+)
 
 
 def load_column_dict(logger=None):
@@ -79,11 +58,14 @@ def load_column_dict(logger=None):
     if os.path.exists(dict_file):
         log(f"[DEBUG] Found dict file: {dict_file}")
         try:
-            df = pd.read_excel(dict_file, sheet_name='dict')
-            log(f"[DEBUG] Loaded dict.xlsx successfully. Shape: {df.shape}")
-            log(f"[DEBUG] First 3 rows:\n{df.head(3)}")
+            df, cached = read_cached_sheet(dict_file, 'dict')
+            if cached:
+                log(f"[DEBUG] Using cached dict.xlsx (file unchanged). Shape: {df.shape}")
+            else:
+                log(f"[DEBUG] Loaded dict.xlsx successfully. Shape: {df.shape}")
+                log(f"[DEBUG] First 3 rows:\n{df.head(3)}")
             if 'old' in df.columns and 'new' in df.columns:
-                return df[['old', 'new']]
+                return df
             else:
                 raise Exception(f"dict.xlsx must have 'old' and 'new' columns. Found columns: {list(df.columns)}")
         except Exception as e:
@@ -93,11 +75,14 @@ def load_column_dict(logger=None):
     if os.path.exists(dict_embed_file):
         log(f"[DEBUG] Found embedded dict file: {dict_embed_file}")
         try:
-            df = pd.read_excel(dict_embed_file, sheet_name='dict')
-            log(f"[DEBUG] Loaded dict_embed.xlsx successfully. Shape: {df.shape}")
-            log(f"[DEBUG] First 3 rows:\n{df.head(3)}")
+            df, cached = read_cached_sheet(dict_embed_file, 'dict')
+            if cached:
+                log(f"[DEBUG] Using cached dict_embed.xlsx (file unchanged). Shape: {df.shape}")
+            else:
+                log(f"[DEBUG] Loaded dict_embed.xlsx successfully. Shape: {df.shape}")
+                log(f"[DEBUG] First 3 rows:\n{df.head(3)}")
             if 'old' in df.columns and 'new' in df.columns:
-                return df[['old', 'new']]
+                return df
             else:
                 raise Exception(f"dict_embed.xlsx must have 'old' and 'new' columns. Found columns: {list(df.columns)}")
         except Exception as e:
@@ -151,16 +136,13 @@ def slc(logger=None):
         # Read data from active sheet
         sheet = wb.sheets[active_sheet.Name]
         data_range = sheet.used_range
-        data = data_range.value
         
-        if not data or len(data) < 1:
-            raise Exception("Active sheet has insufficient data")
+        # Let xlwings' DataFrame converter split off the header row; a header-only
+        # sheet gives an empty frame, which is rejected below
+        df = data_range.options(pd.DataFrame, header=1, index=False).value
         
-        # Convert to DataFrame
-        if len(data) > 1:
-            df = pd.DataFrame(data[1:], columns=data[0])
-        else:
-            df = pd.DataFrame(columns=data[0])
+        if df is None or df.empty or all(c is None for c in df.columns):
+            raise Exception("Active sheet has insufficient data")
         
         # Find default columns (date, grp, emp_id, emp_nm)
         date_col = None
@@ -168,16 +150,20 @@ def slc(logger=None):
         emp_id_col = None
         emp_nm_col = None
         
+        # Lowercased header -> first column with that name, for case-insensitive lookups
+        lower_to_col = {}
+        
         for col in df.columns:
             if col:
                 col_lower = str(col).lower()
-                if not date_col and col_lower in [c.lower() for c in DATE_COLUMN_NAMES]:
+                lower_to_col.setdefault(col_lower, col)
+                if not date_col and col_lower in DATE_COLUMN_KEYS:
                     date_col = col
-                if not grp_col and col_lower in [c.lower() for c in GRP_COLUMN_NAMES]:
+                if not grp_col and col_lower in GRP_COLUMN_KEYS:
                     grp_col = col
-                if not emp_id_col and col_lower in [c.lower() for c in EMP_ID_COLUMN_NAMES]:
+                if not emp_id_col and col_lower in EMP_ID_COLUMN_KEYS:
                     emp_id_col = col
-                if not emp_nm_col and col_lower in [c.lower() for c in EMP_NAME_COLUMN_NAMES]:
+                if not emp_nm_col and col_lower in EMP_NAME_COLUMN_KEYS:
                     emp_nm_col = col
         
         # At least emp_nm or emp_id must exist
@@ -210,88 +196,76 @@ def slc(logger=None):
                 rename_map[old_col_name] = col_mapping[old_col_name]
             else:
                 # Try case-insensitive match
-                for col in df.columns:
-                    if col and str(col).lower() == str(old_col_name).lower():
-                        # Don't include if it's a default column
-                        if col not in default_columns:
-                            columns_to_keep.append(col)
-                            rename_map[col] = col_mapping[old_col_name]
-                        break
+                col = lower_to_col.get(str(old_col_name).lower())
+                # Don't include if it's a default column
+                if col is not None and col not in default_columns:
+                    columns_to_keep.append(col)
+                    rename_map[col] = col_mapping[old_col_name]
         
         # Combine default columns with dict columns
         all_columns = default_columns + columns_to_keep
         
-        # Filter to keep only selected columns
-        filtered_df = df[all_columns].copy()
-        
-        # Rename columns from dict according to mapping
-        filtered_df = filtered_df.rename(columns=rename_map)
-        
-        # Standardize default column names
-        default_rename = {}
-        if date_col and date_col in filtered_df.columns:
-            default_rename[date_col] = 'data_dt'
-        if grp_col and grp_col in filtered_df.columns:
-            default_rename[grp_col] = 'grp'
-        if emp_id_col and emp_id_col in filtered_df.columns:
-            default_rename[emp_id_col] = 'emp_id'
-        if emp_nm_col and emp_nm_col in filtered_df.columns:
-            default_rename[emp_nm_col] = 'emp_nm'
-        
-        filtered_df = filtered_df.rename(columns=default_rename)
+        # Final layout as (label, source position) pairs: standard names for the
+        # default columns, dict names for the rest; a repeated sheet header
+        # contributes every column carrying it
+        positions = {}
+        for pos, col in enumerate(df.columns):
+            positions.setdefault(col, []).append(pos)
+        
+        default_names = {date_col: 'data_dt', grp_col: 'grp', emp_id_col: 'emp_id', emp_nm_col: 'emp_nm'}
+        n_default = len(default_columns)
+        layout = []
+        for i, col in enumerate(all_columns):
+            name = default_names[col] if i < n_default else rename_map.get(col, col)
+            layout.extend((name, pos) for pos in positions[col])
+        
+        # Order data_dt, grp, emp_id, emp_nm first (stable, so the rest keep their order)
+        priority_rank = {'data_dt': 0, 'grp': 1, 'emp_id': 2, 'emp_nm': 3}
+        layout.sort(key=lambda item: priority_rank.get(item[0], len(priority_rank)))
+        
+        # Build the output frame with one positional take (a new frame, so no
+        # .copy() is needed before writing to it); labels assigned once
+        filtered_df = df.take([pos for _, pos in layout], axis=1)
+        out_names = [name for name, _ in layout]
+        filtered_df.columns = out_names
+        
+        # Which standard columns exist, checked once for the steps below
+        has_emp_id = 'emp_id' in out_names
         
         # Keep emp_id as string without padding - just remove .0 suffix if present
-        if 'emp_id' in filtered_df.columns:
+        if has_emp_id:
             filtered_df['emp_id'] = filtered_df['emp_id'].fillna('').astype(str).str.replace('.0', '', regex=False)
         
-        # Reorder columns to ensure data_dt, grp, emp_id, emp_nm order
-        priority_cols = []
-        if 'data_dt' in filtered_df.columns:
-            priority_cols.append('data_dt')
-        if 'grp' in filtered_df.columns:
-            priority_cols.append('grp')
-        if 'emp_id' in filtered_df.columns:
-            priority_cols.append('emp_id')
-        if 'emp_nm' in filtered_df.columns:
-            priority_cols.append('emp_nm')
-        
-        other_cols = [c for c in filtered_df.columns if c not in priority_cols]
-        filtered_df = filtered_df[priority_cols + other_cols]
-        
         # Create new sheet with filtered and renamed data
         new_sheet_name = 'slc'
         
-        # Remove existing sheet with the same name if it exists
+        # No redraws or recalculation while the output sheet is rebuilt
+        app_api, saved_state = begin_performance_mode(app)
         try:
-            if new_sheet_name in [s.name for s in wb.sheets]:
+            # Remove existing sheet with the same name; a missing sheet just raises
+            try:
                 wb.sheets[new_sheet_name].delete()
-        except Exception:
-            pass
-        
-        # Create new sheet
-        new_sheet = wb.sheets.add(name=new_sheet_name, after=sheet)
-        
-        # Write headers
-        new_sheet.range('A1').value = filtered_df.columns.tolist()
-        
-        # Pre-format emp_id column as text before writing data
-        if not filtered_df.empty and 'emp_id' in filtered_df.columns:
-            emp_id_col_idx = filtered_df.columns.tolist().index('emp_id') + 1  # 1-based
-            emp_id_col_letter = chr(64 + emp_id_col_idx) if emp_id_col_idx <= 26 else 'A' + chr(64 + emp_id_col_idx - 26)
-            last_row = len(filtered_df) + 1
-            emp_id_range = new_sheet.range(f'{emp_id_col_letter}2:{emp_id_col_letter}{last_row}')
-            emp_id_range.number_format = '@'  # Set as text format
-        
-        # Write filtered data with new column names
-        if not filtered_df.empty:
-            # Convert to list of lists to preserve string types
-            data_to_write = []
-            for _, row in filtered_df.iterrows():
-                data_to_write.append(row.tolist())
-            new_sheet.range('A2').value = data_to_write
-        
-        # Auto-fit columns
-        new_sheet.autofit()
+            except Exception:
+                pass
+            
+            # Create new sheet
+            new_sheet = wb.sheets.add(name=new_sheet_name, after=sheet)
+            
+            # Pre-format emp_id column as text before writing data
+            if not filtered_df.empty and has_emp_id:
+                emp_id_col_idx = filtered_df.columns.get_loc('emp_id') + 1  # 1-based
+                last_row = len(filtered_df) + 1
+                emp_id_range = new_sheet.range((2, emp_id_col_idx), (last_row, emp_id_col_idx))
+                emp_id_range.number_format = '@'  # Set as text format
+            
+            # Write headers and filtered data with one sized Range.Value set
+            block = frame_block(filtered_df)
+            new_sheet.range((1, 1), block.shape).value = block
+            
+            # Auto-fit column widths only; rows of plain values keep the default height
+            new_sheet.autofit('columns')
+        finally:
+            end_performance_mode(app_api, saved_state)
         
         return f"✓ Created sheet '{new_sheet_name}' with {len(filtered_df.columns)} selected columns"
         
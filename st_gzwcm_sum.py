@@ -4,7 +4,6 @@ Loads emp.xlsx (or emp_embed.xlsx as fallback) and filters active workbook data.
 """
 import os
 import sys
-import re
 
 # Initialize pywin32 for frozen exe
 if getattr(sys, 'frozen', False):
@@ -15,32 +14,13 @@ import xlwings as xw
 import pandas as pd
 
 # Import shared constants
-from st_gzwcm_constants import EMP_NAME_COLUMN_NAMES, EMP_ID_COLUMN_NAMES, DATE_COLUMN_NAMES, GRP_COLUMN_NAMES
-
-
-def sanitize_sheet_name(name, suffix=''):
-    """Sanitize sheet name to comply with Excel restrictions.
-    
-    Args:
-        name: Original sheet name
-        suffix: Suffix to add (e.g., '_filtered')
-    
-    Returns:
-        Valid Excel sheet name (max 31 chars, no invalid chars)
-    """
-    # Remove invalid characters: : \ / ? * [ ]
-    clean_name = re.sub(r'[:\\/*?\[\]]', '_', str(name))
-    
-    # Add suffix
-    full_name = f"{clean_name}{suffix}"
-    
-    # Limit to 31 characters
-    if len(full_name) > 31:
-        # Keep as much of the original name as possible
-        max_base_len = 31 - len(suffix)
-        full_name = f"{clean_name[:max_base_len]}{suffix}"
-    
-    return full_name
+from st_gzwcm_constants import (
+    EMP_NAME_COLUMN_NAMES, EMP_ID_COLUMN_NAMES,
+    EMP_NAME_COLUMN_KEYS, EMP_ID_COLUMN_KEYS, DATE_COLUMN_KEYS, GRP_COLUMN_KEYS,
+)
+from st_gzwcm_common import (
+    begin_performance_mode, end_performance_mode, frame_block, read_cached_sheet,
+)
 
 
 def load_employee_list(logger=None):
@@ -79,9 +59,12 @@ def load_employee_list(logger=None):
     if os.path.exists(emp_file):
         log(f"[DEBUG] Found emp file: {emp_file}")
         try:
-            df = pd.read_excel(emp_file, sheet_name='emp')
-            log(f"[DEBUG] Loaded emp.xlsx successfully. Shape: {df.shape}")
-            log(f"[DEBUG] Columns: {list(df.columns)}")
+            df, cached = read_cached_sheet(emp_file, 'emp')
+            if cached:
+                log(f"[DEBUG] Using cached emp.xlsx (file unchanged). Shape: {df.shape}")
+            else:
+                log(f"[DEBUG] Loaded emp.xlsx successfully. Shape: {df.shape}")
+                log(f"[DEBUG] Columns: {list(df.columns)}")
             return df
         except Exception as e:
             raise Exception(f"Error loading emp.xlsx: {e}")
@@ -90,9 +73,12 @@ def load_employee_list(logger=None):
     if os.path.exists(emp_embed_file):
         log(f"[DEBUG] Found embedded emp file: {emp_embed_file}")
         try:
-            df = pd.read_excel(emp_embed_file, sheet_name='emp')
-            log(f"[DEBUG] Loaded emp_embed.xlsx successfully. Shape: {df.shape}")
-            log(f"[DEBUG] Columns: {list(df.columns)}")
+            df, cached = read_cached_sheet(emp_embed_file, 'emp')
+            if cached:
+                log(f"[DEBUG] Using cached emp_embed.xlsx (file unchanged). Shape: {df.shape}")
+            else:
+                log(f"[DEBUG] Loaded emp_embed.xlsx successfully. Shape: {df.shape}")
+                log(f"[DEBUG] Columns: {list(df.columns)}")
             return df
         except Exception as e:
             raise Exception(f"Error loading emp_embed.xlsx: {e}")
@@ -137,7 +123,7 @@ def sum(logger=None):
         # Find emp_nm column in emplist
         emplist_emp_nm_col = None
         for col in emplist.columns:
-            if col and str(col).lower() in [c.lower() for c in EMP_NAME_COLUMN_NAMES]:
+            if col and str(col).lower() in EMP_NAME_COLUMN_KEYS:
                 emplist_emp_nm_col = col
                 break
         
@@ -145,7 +131,7 @@ def sum(logger=None):
             raise Exception(f"Could not find emp_nm column in emp.xlsx. Expected: {', '.join(EMP_NAME_COLUMN_NAMES)}")
         
         # Get set of emp_names to keep
-        emp_names_to_keep = set(emplist[emplist_emp_nm_col].dropna().unique())
+        emp_names_to_keep = frozenset(emplist[emplist_emp_nm_col].dropna().unique())
         
         # Read data from active sheet
         sheet = wb.sheets[active_sheet.Name]
@@ -155,31 +141,46 @@ def sum(logger=None):
         if not data or len(data) < 2:
             raise Exception("Active sheet has insufficient data")
         
-        # Convert to DataFrame
-        df = pd.DataFrame(data[1:], columns=data[0])
-        
-        # Find required columns
+        # Find required columns from the header row, before any DataFrame is built
+        header = data[0]
         date_col = None
         grp_col = None
         emp_id_col = None
         emp_nm_col = None
+        emp_nm_idx = None
         
-        for col in df.columns:
+        for idx, col in enumerate(header):
             if col:
                 col_lower = str(col).lower()
-                if not date_col and col_lower in [c.lower() for c in DATE_COLUMN_NAMES]:
+                if not date_col and col_lower in DATE_COLUMN_KEYS:
                     date_col = col
-                if not grp_col and col_lower in [c.lower() for c in GRP_COLUMN_NAMES]:
+                if not grp_col and col_lower in GRP_COLUMN_KEYS:
                     grp_col = col
-                if not emp_id_col and col_lower in [c.lower() for c in EMP_ID_COLUMN_NAMES]:
+                if not emp_id_col and col_lower in EMP_ID_COLUMN_KEYS:
                     emp_id_col = col
-                if not emp_nm_col and col_lower in [c.lower() for c in EMP_NAME_COLUMN_NAMES]:
+                if not emp_nm_col and col_lower in EMP_NAME_COLUMN_KEYS:
                     emp_nm_col = col
+                    emp_nm_idx = idx
+                if date_col and grp_col and emp_id_col and emp_nm_col:
+                    break
         
         # Must have emp_id
         if not emp_id_col:
             raise Exception(f"Could not find emp_id column in active sheet. Expected: {', '.join(EMP_ID_COLUMN_NAMES)}")
         
+        # Filter to keep only emp_names in emplist
+        if not emp_nm_col:
+            raise Exception("Active sheet must have emp_nm column for filtering")
+        
+        # Filter the raw rows, so the DataFrame only ever holds matching employees
+        rows = [r for r in data[1:] if r[emp_nm_idx] in emp_names_to_keep]
+        
+        if not rows:
+            raise Exception("No matching employees found in active sheet")
+        
+        # Convert to DataFrame
+        df = pd.DataFrame(rows, columns=header)
+        
         # Standardize column names
         rename_dict = {}
         if date_col:
@@ -197,34 +198,21 @@ def sum(logger=None):
         if 'emp_id' in df.columns:
             df['emp_id'] = df['emp_id'].fillna('').astype(str).str.replace('.0', '', regex=False).str.zfill(8)
         
-        # Filter to keep only emp_names in emplist
-        if 'emp_nm' not in df.columns:
-            raise Exception("Active sheet must have emp_nm column for filtering")
-        
-        df = df[df['emp_nm'].isin(emp_names_to_keep)].copy()
-        
-        if df.empty:
-            raise Exception("No matching employees found in active sheet")
+        # Few distinct groups: categorical codes make the grp sort and groupby integer work
+        if 'grp' in df.columns:
+            df['grp'] = df['grp'].astype('category')
         
         # Define priority columns order
-        priority_cols = []
-        if 'data_dt' in df.columns:
-            priority_cols.append('data_dt')
-        if 'grp' in df.columns:
-            priority_cols.append('grp')
-        if 'emp_id' in df.columns:
-            priority_cols.append('emp_id')
-        if 'emp_nm' in df.columns:
-            priority_cols.append('emp_nm')
+        priority_cols = [c for c in ('data_dt', 'grp', 'emp_id', 'emp_nm') if c in df.columns]
         
         # Get other columns (numeric and non-numeric)
-        other_cols = [c for c in df.columns if c not in priority_cols]
+        priority_set = set(priority_cols)
+        other_cols = [c for c in df.columns if c not in priority_set]
         
         # Identify numeric columns for summing
-        numeric_cols = []
-        for col in other_cols:
-            if pd.api.types.is_numeric_dtype(df[col]):
-                numeric_cols.append(col)
+        # One dtype pass over the frame; bool counts as numeric, as is_numeric_dtype did
+        numeric_set = set(df.select_dtypes(include=['number', 'bool']).columns)
+        numeric_cols = [c for c in other_cols if c in numeric_set]
         
         if not numeric_cols:
             raise Exception("No numeric columns found to sum")
@@ -240,8 +228,7 @@ def sum(logger=None):
         for col in numeric_cols:
             agg_dict[col] = 'sum'
         for col in other_cols:
-            if col not in numeric_cols:
-                agg_dict[col] = 'first'
+            agg_dict.setdefault(col, 'first')
         
         # Sum by emp_id
         summed_df = df.groupby('emp_id', as_index=False).agg(agg_dict)
@@ -263,7 +250,7 @@ def sum(logger=None):
         summed_df = summed_df[final_columns]
         
         # Create total sum row first
-        total_row = {}
+        total_row = dict.fromkeys(final_columns)
         if 'data_dt' in priority_cols:
             total_row['data_dt'] = sample_dt
         if 'grp' in priority_cols:
@@ -271,76 +258,69 @@ def sum(logger=None):
         total_row['emp_id'] = 'all'
         if 'emp_nm' in priority_cols:
             total_row['emp_nm'] = 'all'
-        
-        for col in numeric_cols:
-            total_row[col] = summed_df[col].sum()
-        for col in other_cols:
-            if col not in numeric_cols:
-                total_row[col] = None
+        total_row.update(summed_df[numeric_cols].sum())
+        total_df = pd.DataFrame([total_row], columns=final_columns)
         
         # Build result with total on top, then group sum before each group
-        result_rows = [total_row]
-        
         if 'grp' in summed_df.columns:
-            # Get unique groups in sorted order
-            unique_grps = summed_df['grp'].dropna().unique()
+            # Employees without a group are left out, as before
+            member_df = summed_df[summed_df['grp'].notna()]
+            
+            # One groupby for all group sums, in the order the groups appear
+            grp_sum_df = member_df.groupby('grp', sort=False, observed=True)[numeric_cols].sum().reset_index()
+            sum_labels = grp_sum_df['grp'].astype(str) + '_sum'
+            grp_sum_df['emp_id'] = sum_labels
+            grp_sum_df['emp_nm'] = sum_labels
+            if 'data_dt' in priority_cols:
+                grp_sum_df['data_dt'] = sample_dt
+            grp_sum_df = grp_sum_df.reindex(columns=final_columns)
+            
+            # summed_df is already sorted by grp, so a stable sort on grp puts each
+            # sum row (concatenated first) directly ahead of its employees
+            grouped_df = pd.concat([grp_sum_df, member_df], ignore_index=True)
+            grouped_df = grouped_df.sort_values('grp', kind='mergesort')
             
-            for grp_name in unique_grps:
-                # Add group sum row first
-                grp_data = summed_df[summed_df['grp'] == grp_name]
-                grp_sum_row = {}
-                if 'data_dt' in priority_cols:
-                    grp_sum_row['data_dt'] = sample_dt
-                grp_sum_row['grp'] = grp_name
-                grp_sum_row['emp_id'] = f"{grp_name}_sum"
-                grp_sum_row['emp_nm'] = f"{grp_name}_sum"
-                
-                for col in numeric_cols:
-                    grp_sum_row[col] = grp_data[col].sum()
-                for col in other_cols:
-                    if col not in numeric_cols:
-                        grp_sum_row[col] = None
-                
-                result_rows.append(grp_sum_row)
-                
-                # Then add all employees in this group
-                result_rows.extend(grp_data.to_dict('records'))
+            records_count = len(member_df)
+            groups_count = len(grp_sum_df)
         else:
             # No group column, just use summed data
-            result_rows.extend(summed_df.to_dict('records'))
+            grouped_df = summed_df
+            records_count = len(summed_df)
+            groups_count = 0
         
         # Create final result DataFrame
-        result_df = pd.DataFrame(result_rows, columns=final_columns)
+        result_df = pd.concat([total_df, grouped_df], ignore_index=True)
         
         # Create new sheet with filtered data
         new_sheet_name = 'sum'
         
-        # Remove existing sheet with the same name if it exists
+        # No redraws or recalculation while the output sheet is rebuilt
+        app_api, saved_state = begin_performance_mode(app)
         try:
-            if new_sheet_name in [s.name for s in wb.sheets]:
+            # Remove existing sheet with the same name; a missing sheet just raises
+            try:
                 wb.sheets[new_sheet_name].delete()
-        except Exception:
-            pass
-        
-        # Create new sheet
-        new_sheet = wb.sheets.add(name=new_sheet_name, after=sheet)
-        
-        # Pre-format emp_id column as text
-        if 'emp_id' in result_df.columns:
-            emp_id_col_idx = result_df.columns.tolist().index('emp_id') + 1
-            emp_id_col_letter = chr(64 + emp_id_col_idx)
-            new_sheet.range(f'{emp_id_col_letter}:{emp_id_col_letter}').number_format = '@'
-        
-        # Write filtered data
-        new_sheet.range('A1').value = result_df.columns.tolist()
-        new_sheet.range('A2').value = result_df.values.tolist()
-        
-        # Auto-fit columns
-        new_sheet.autofit()
+            except Exception:
+                pass
+            
+            # Create new sheet
+            new_sheet = wb.sheets.add(name=new_sheet_name, after=sheet)
+            
+            # Pre-format emp_id column as text
+            if 'emp_id' in result_df.columns:
+                emp_id_col_idx = result_df.columns.get_loc('emp_id') + 1  # 1-based
+                last_row = len(result_df) + 1
+                new_sheet.range((2, emp_id_col_idx), (last_row, emp_id_col_idx)).number_format = '@'
+            
+            # Write headers and data with one sized Range.Value set
+            block = frame_block(result_df)
+            new_sheet.range((1, 1), block.shape).value = block
+            
+            # Auto-fit column widths only; rows of plain values keep the default height
+            new_sheet.autofit('columns')
+        finally:
+            end_performance_mode(app_api, saved_state)
         
-        # Count records and groups
-        records_count = len([r for r in result_rows if not str(r.get('emp_id', '')).endswith('_sum') and r.get('emp_id') != 'all'])
-        groups_count = len([r for r in result_rows if str(r.get('emp_id', '')).endswith('_sum')])
         return f"✓ Created sheet '{new_sheet_name}' with {records_count} employee records, {groups_count} group sums, and 1 total"
         
     except Exception as e: